@@ -15,37 +15,221 @@ Plots:
     (1) ONLY species N
     (2) Avg speed & Avg size
     (3) Avg sense
+  In a per-session folder, figures are skipped when the folder's .overall_hash/
+  .species_hash sidecar matches the cleaned data (and PNGs exist); pass --no-cache
+  to always redraw. Timestamped folders are new every run, so they always redraw.
 
 CSV exports:
   overall_summary_<timestamp>__<tag>.csv
   species_summary_<timestamp>__<tag>.csv
 """
 import argparse
+import glob
 import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from session_log import latest_session_id
+
+# Optional pyarrow: fast CSV reader (--fast-io) and the Parquet cache; pandas is used when absent
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pacsv = pq = None
+
+# Optional numba: the cleaners' groupby-means then run as a compiled kernel
+try:
+    import numba
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+if HAVE_NUMBA:
+    @numba.njit(parallel=True, cache=True)
+    def _gb_mean_kernel(codes, vals, ngroups):
+        """NaN-skipping mean of each column of `vals` per group code (columns in parallel)."""
+        n, ncols = vals.shape
+        out = np.empty((ngroups, ncols))
+        for j in numba.prange(ncols):
+            sums = np.zeros(ngroups)
+            cnts = np.zeros(ngroups)
+            for i in range(n):
+                v = vals[i, j]
+                if v == v:
+                    c = codes[i]
+                    sums[c] += v
+                    cnts[c] += 1.0
+            for g in range(ngroups):
+                out[g, j] = sums[g] / cnts[g] if cnts[g] > 0 else np.nan
+        return out
 
-# Headless plotting
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
 
 
 # ------------------------- utilities -------------------------
 def ensure_dir(p: str) -> None:
     os.makedirs(p, exist_ok=True)
 
-def timestamp(tag: str | None = None) -> str:
-    t = time.strftime("%Y%m%d_%H%M%S")
+def timestamp(tag: str | None = None, t: str | None = None) -> str:
+    """Stamp for output names; pass `t` (one strftime per run) so a run's names all match."""
+    t = t or time.strftime("%Y%m%d_%H%M%S")
     return f"{t}__{tag}" if tag else t
 
 def exists(path: str | None) -> bool:
     return bool(path and os.path.exists(path))
 
+def parse_figsize(s: str) -> tuple[float, float]:
+    """'10,9' -> (10.0, 9.0) for argparse."""
+    try:
+        w, h = (float(v) for v in s.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTH,HEIGHT in inches, got {s!r}")
+    return (w, h)
+
+def coerce_numeric(df: pd.DataFrame, cols) -> None:
+    """Cast the present, not-yet-numeric `cols` in one block (in place); junk becomes NaN."""
+    todo = [c for c in cols if c in df.columns and not is_numeric_dtype(df[c])]
+    if todo:
+        # one to_numeric sweep over the slice, then one astype for the float columns
+        # (int columns stay as parsed: they may now hold NaN)
+        df[todo] = (df[todo].apply(pd.to_numeric, errors="coerce")
+                            .astype({c: "float32" for c in todo if c not in INT_COLS}))
+
+def frame_hash(df: pd.DataFrame | None, *extra) -> str:
+    """Content hash of a frame (values only) plus any plot settings in `extra`."""
+    h = 0 if df is None or len(df) == 0 else int(pd.util.hash_pandas_object(df, index=False).sum())
+    return "|".join(map(str, (h, *extra)))
+
+def plots_cached(outdir: str, name: str, key: str, png_pattern: str) -> bool:
+    """True when <outdir>/.<name>_hash equals `key` and matching PNGs are still on disk."""
+    try:
+        with open(os.path.join(outdir, f".{name}_hash")) as f:
+            prev = f.read().strip()
+    except OSError:
+        return False
+    return prev == key and bool(glob.glob(os.path.join(outdir, png_pattern)))
+
+def store_plot_hash(outdir: str, name: str, key: str) -> None:
+    with open(os.path.join(outdir, f".{name}_hash"), "w") as f:
+        f.write(key + "\n")
+
+
+# ------------------------- schema ----------------------------
+OVERALL_NUM_COLS = ("day","n","alive_end","ate0","ate1","ate2p",
+                    "avg_speed","avg_size","avg_sense","avg_metabolism",
+                    "food_per_day","day_steps")
+SPECIES_NUM_COLS = ("day","n","alive_end","ate0","ate1","ate2p",
+                    "avg_speed","avg_size","avg_sense","metabolism")
+TEXT_COLS = ("session_id","species_name")
+CATEGORY_COLS = ("session_id","species_id","species_name")
+INT_COLS = ("day","n","alive_end","ate0","ate1","ate2p","food_per_day","day_steps","species_id")
+
+# Narrow read dtypes (int32/float32): no inference pass, half the bytes per column.
+# Their keys are also the only columns read (see _read_csv).
+OVERALL_DTYPES = {c: ("int32" if c in INT_COLS else "float32") for c in OVERALL_NUM_COLS}
+SPECIES_DTYPES = {c: ("int32" if c in INT_COLS else "float32") for c in (*SPECIES_NUM_COLS, "species_id")}
+for _d in (OVERALL_DTYPES, SPECIES_DTYPES):
+    _d.update(dict.fromkeys(TEXT_COLS, str))
+SESSION_CHUNK_ROWS = 100_000       # rows parsed at a time when streaming one session out of a log
+PARQUET_ROW_GROUP = 100_000
+NUMBA_GROUPBY_MIN_ROWS = 100_000   # below this the JIT compile costs more than it saves
+
+SPECIES_OVERLAY_MAX = 30          # overall plot overlays at most this many species (highest mean N)
+
+# Default figure geometry for batch PNGs (override with --figsize / --dpi)
+DEFAULT_FIGSIZE = (10.0, 9.0)
+DEFAULT_DPI = 100
+# zlib level 1: PNG encoding dominates savefig at default level 6, for a few % larger files
+PNG_SAVE_KW = {"pil_kwargs": {"compress_level": 1, "optimize": False}}
+
 
 # ------------------------- loading ---------------------------
-def load_csvs(overall_path: str, species_path: str | None):
+def _arrow_column_types(dtypes: dict) -> dict:
+    """The pandas read schema as Arrow types, so the reader skips type inference."""
+    arrow = {"int32": pa.int32(), "float32": pa.float32(), str: pa.string()}
+    return {c: arrow[t] for c, t in dtypes.items()}
+
+def _read_session_rows(path: str, dtypes: dict, usecols, sid: str) -> pd.DataFrame:
+    """Stream `path` in chunks keeping only session `sid`'s rows."""
+    for dt in (dtypes, None):
+        parts = []
+        try:
+            with pd.read_csv(path, usecols=usecols, dtype=dt, engine="c", on_bad_lines="skip",
+                             chunksize=SESSION_CHUNK_ROWS) as reader:
+                for chunk in reader:
+                    parts.append(chunk.loc[chunk["session_id"] == sid])
+        except ValueError as e:
+            if dt is None:
+                raise
+            print(f"[WARN] Typed read failed on {path} ({e}); inferring dtypes.", file=sys.stderr)
+            continue
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0].reset_index(drop=True)
+
+def _read_csv(path: str, dtypes: dict, fast_io: bool = False, session: str | None = None) -> pd.DataFrame:
+    # Header probe: parse only the columns this module uses (dtypes' keys) that the file has
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in header if c in dtypes] or None
+    dtypes = {c: t for c, t in dtypes.items() if c in header}
+
+    if session is not None and "session_id" in header:
+        return _read_session_rows(path, dtypes, usecols, session)
+    if fast_io and pacsv is not None:
+        try:
+            opts = pacsv.ConvertOptions(column_types=_arrow_column_types(dtypes),
+                                        include_columns=usecols)
+            # the table is dropped right away, so let Arrow free columns as they convert
+            return pacsv.read_csv(path, convert_options=opts).to_pandas(split_blocks=True,
+                                                                        self_destruct=True)
+        except pa.ArrowInvalid as e:
+            # e.g. a stray non-numeric value; pandas + to_numeric(coerce) copes with it
+            print(f"[WARN] Fast CSV reader failed on {path} ({e}); falling back to pandas.", file=sys.stderr)
+    try:
+        return pd.read_csv(path, usecols=usecols, dtype=dtypes, engine="c", on_bad_lines="skip")
+    except ValueError as e:
+        # blanks in an int column or non-numeric junk: infer, then coerce_numeric in _load_table
+        print(f"[WARN] Typed read failed on {path} ({e}); inferring dtypes.", file=sys.stderr)
+        return pd.read_csv(path, usecols=usecols, engine="c", on_bad_lines="skip")
+
+def _load_table(path: str, dtypes: dict, num_cols, fast_io: bool,
+                session: str | None, use_cache: bool) -> pd.DataFrame:
+    """
+    Read one CSV with its numeric columns coerced, via a sibling <path>.parquet cache
+    (pyarrow only). The cache is reused while it is newer than the CSV and rewritten
+    after every full parse; session reads filter the cached row groups. Session reads
+    never write it: they stream one session out of the CSV, and the launchers' runs
+    follow a UI session that just appended to the CSV, so a cache would be stale anyway.
+    """
+    cache = path + ".parquet"
+    if use_cache and pa is not None and exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        try:
+            # like the CSV read: no session_id column means there is nothing to filter on
+            filters = None
+            if session is not None and "session_id" in pq.read_schema(cache).names:
+                filters = [("session_id", "==", session)]
+            return pd.read_parquet(cache, engine="pyarrow", filters=filters)
+        except (OSError, pa.ArrowException) as e:
+            print(f"[WARN] Ignoring unreadable cache {cache} ({e}).", file=sys.stderr)
+
+    df = _read_csv(path, dtypes, fast_io, session)
+    # The only numeric coercion: everything downstream assumes these columns are numeric
+    coerce_numeric(df, num_cols)
+
+    if use_cache and pa is not None and session is None:
+        try:
+            df.to_parquet(cache, engine="pyarrow", compression="zstd",
+                          row_group_size=PARQUET_ROW_GROUP, index=False)
+        except (OSError, pa.ArrowException) as e:
+            print(f"[WARN] Could not write cache {cache} ({e}).", file=sys.stderr)
+    return df
+
+def load_csvs(overall_path: str, species_path: str | None, fast_io: bool = False,
+              session: str | None = None, use_cache: bool = True):
+    """Load both CSVs; with `session`, keep only that session's rows (streamed or from cache)."""
     if not exists(overall_path):
         print(
             "\n[ERROR] Overall CSV not found.\n"
@@ -55,10 +239,21 @@ def load_csvs(overall_path: str, species_path: str | None):
             "  • Confirm the logger paths in evo_sim/ui/app.py match these args.\n",
             file=sys.stderr
         )
-        sys.exit(1)
+        raise FileNotFoundError(overall_path)   # main() turns this into exit status 1
 
-    df_overall = pd.read_csv(overall_path)
-    df_species = pd.read_csv(species_path) if (species_path and exists(species_path)) else None
+    if fast_io and pacsv is None:
+        print("[WARN] --fast-io requested but pyarrow is not installed; using pandas.", file=sys.stderr)
+
+    df_overall = _load_table(overall_path, OVERALL_DTYPES, OVERALL_NUM_COLS, fast_io, session, use_cache)
+    df_species = (_load_table(species_path, SPECIES_DTYPES, SPECIES_NUM_COLS, fast_io, session, use_cache)
+                  if (species_path and exists(species_path)) else None)
+
+    # Repeated identifiers as categoricals: filters and groupbys then hash int codes, not strings
+    for df in (df_overall, df_species):
+        if df is not None:
+            cats = [c for c in CATEGORY_COLS if c in df.columns]
+            if cats:
+                df[cats] = df[cats].astype("category")
     return df_overall, df_species
 
 
@@ -69,54 +264,90 @@ def _latest_session_id(df: pd.DataFrame) -> str | None:
     s = df["session_id"].dropna()
     return s.iloc[-1] if len(s) else None
 
-
 # ------------------------- plotting --------------------------
+_plt = None   # matplotlib.pyplot once _pyplot() has run
+
+def _pyplot():
+    """Import matplotlib on first use (headless Agg, batch rcParams); CSV-only runs never pay for it."""
+    global _plt
+    if _plt is None:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        # Batch rendering: cheaper line rasterization for long day series
+        matplotlib.rcParams.update({
+            "path.simplify": True,
+            "path.simplify_threshold": 1.0,
+            "agg.path.chunksize": 10000,
+            "figure.max_open_warning": 0,
+        })
+        plt.ioff()
+        _plt = plt
+    return _plt
+
+def _f32(obj) -> np.ndarray:
+    """Series/frame -> plain float32 ndarray, so matplotlib skips its own conversion."""
+    return obj.to_numpy(dtype=np.float32, na_value=np.nan)
+
+def _plot_columns(ax, df: pd.DataFrame, cols, labels, **kw) -> list:
+    """Draw every present column of `cols` against day with ONE ax.plot call."""
+    present = [(c, l) for c, l in zip(cols, labels) if c in df.columns]
+    if not present:
+        return []
+    lines = ax.plot(_f32(df["day"]), _f32(df[[c for c, _ in present]]), **kw)
+    for line, (_, label) in zip(lines, present):
+        line.set_label(label)
+    return lines
+
+
 def plot_overall(df_overall: pd.DataFrame,
-                 df_species: pd.DataFrame | None,
+                 g_species: pd.DataFrame | None,
                  outdir: str,
-                 tag: str | None):
+                 stamp: str,
+                 figsize: tuple[float, float] = DEFAULT_FIGSIZE,
+                 dpi: int = DEFAULT_DPI):
     """
     (1) ONLY Total N + per‑species N
     (2) Avg speed & Avg size
     (3) Avg sense
+
+    Expects the day-aggregated frames from clean_overall / clean_species;
+    nothing is re-coerced or re-grouped here.
     """
-    ensure_dir(outdir)
-    fig, ax = plt.subplots(3, 1, figsize=(10, 11), sharex=True)
+    plt = _pyplot()
+    from matplotlib.collections import LineCollection
+    fig, ax = plt.subplots(3, 1, figsize=figsize, sharex=True)
+    day = _f32(df_overall["day"]) if "day" in df_overall.columns else None
 
     # (1) Total N + per-species N
-    g_overall = df_overall.copy()
-    for col in ("day", "n"):
-        if col in g_overall.columns:
-            g_overall[col] = pd.to_numeric(g_overall[col], errors="coerce")
-
-    if "session_id" in g_overall.columns:
-        g_overall = g_overall.groupby("day", as_index=False)["n"].mean()
-
-    if {"day", "n"} <= set(g_overall.columns):
-        ax[0].plot(g_overall["day"], g_overall["n"],
-                   label="Total N", color="black", linewidth=2.25)
-
-    if df_species is not None and len(df_species) > 0:
-        dfs = df_species.copy()
-        for col in ("day", "n"):
-            if col in dfs.columns:
-                dfs[col] = pd.to_numeric(dfs[col], errors="coerce")
-
-        has_sid = "species_id" in dfs.columns
-        has_sname = "species_name" in dfs.columns
-        group_keys = []
-        if has_sid:   group_keys.append("species_id")
-        if has_sname: group_keys.append("species_name")
-        group_keys.append("day")
+    if {"day", "n"} <= set(df_overall.columns):
+        ax[0].plot(day, _f32(df_overall["n"]),
+                   label="Total N", color="black", linewidth=2.25, rasterized=True)
 
+    if g_species is not None and len(g_species) > 0:
+        has_sid = "species_id" in g_species.columns
+        has_sname = "species_name" in g_species.columns
         try:
-            g_species = dfs.groupby(group_keys, as_index=False)["n"].mean()
             species_keys = (["species_id", "species_name"] if (has_sid and has_sname)
                             else (["species_id"] if has_sid else ["species_name"]))
-            for spec_key, sub in g_species.groupby(species_keys):
-                label = ("N — " + " ".join(str(v) for v in spec_key if not isinstance(spec_key, float))) \
-                        if isinstance(spec_key, tuple) else f"N — {spec_key}"
-                ax[0].plot(sub["day"], sub["n"], linewidth=1.6, label=label)
+            # One wide frame (day x species) -> every species line in one LineCollection
+            pv = g_species.pivot(index="day", columns=species_keys, values="n")
+            if pv.shape[1] > SPECIES_OVERLAY_MAX:
+                pv = pv[pv.mean().nlargest(SPECIES_OVERLAY_MAX).index]
+                print(f"[INFO] Overlaying the {SPECIES_OVERLAY_MAX} species with the highest mean N.")
+            x, Y = _f32(pv.index), _f32(pv)
+            segments = np.stack([np.broadcast_to(x, Y.T.shape), Y.T], axis=-1)   # (species, day, xy)
+            cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+            colors = [cycle[i % len(cycle)] for i in range(pv.shape[1])]
+            ax[0].add_collection(LineCollection(segments, colors=colors, linewidths=1.6, rasterized=True))
+            ax[0].autoscale_view()
+            # Labels "N — <id> <name>" built column-wise; data-less proxies give the legend one entry each
+            keys = pv.columns.to_frame(index=False).astype(str)
+            names = keys.iloc[:, 0]
+            if keys.shape[1] > 1:
+                names = names.str.cat(keys.iloc[:, 1:], sep=" ")
+            for color, label in zip(colors, ("N — " + names).tolist()):
+                ax[0].plot([], [], color=color, linewidth=1.6, label=label)
         except Exception as e:
             print(f"[WARN] Skipping per-species N overlay: {e}", file=sys.stderr)
 
@@ -125,32 +356,86 @@ def plot_overall(df_overall: pd.DataFrame,
     ax[0].grid(alpha=0.25)
 
     # (2) Avg speed & Avg size
-    if "avg_speed" in df_overall.columns:
-        ax[1].plot(df_overall["day"], df_overall["avg_speed"], label="Avg speed")
-    if "avg_size" in df_overall.columns:
-        ax[1].plot(df_overall["day"], df_overall["avg_size"],  label="Avg size")
+    _plot_columns(ax[1], df_overall, ("avg_speed", "avg_size"), ("Avg speed", "Avg size"), rasterized=True)
     ax[1].set_ylabel("Trait value")
     ax[1].legend(loc="best")
     ax[1].grid(alpha=0.25)
 
     # (3) Avg sense
     if "avg_sense" in df_overall.columns:
-        ax[2].plot(df_overall["day"], df_overall["avg_sense"],
-                   color="tab:purple", label="Avg sense")
+        ax[2].plot(day, _f32(df_overall["avg_sense"]),
+                   color="tab:purple", label="Avg sense", rasterized=True)
     ax[2].set_xlabel("Day")
     ax[2].set_ylabel("Sense")
     ax[2].legend(loc="best")
     ax[2].grid(alpha=0.25)
 
     fig.tight_layout()
-    png = os.path.join(outdir, f"overall_trends_{timestamp(tag)}.png")
-    fig.savefig(png, dpi=160)
+    png = os.path.join(outdir, f"overall_trends_{stamp}.png")
+    fig.savefig(png, dpi=dpi, **PNG_SAVE_KW)
     plt.close(fig)
     print(f"[OK] Saved {png}")
 
 
-def plot_species(df_species: pd.DataFrame, outdir: str, tag: str | None):
-    """Species figures: N only (top), Speed&Size, Sense."""
+# One (fig, ax) per process, reused for every species that process renders
+_species_fig = None
+
+def _species_figure(figsize):
+    """Return the cached 3-panel figure with cleared axes (built on first use)."""
+    global _species_fig
+    if _species_fig is not None and tuple(_species_fig[0].get_size_inches()) != tuple(figsize):
+        _release_species_figure()
+    if _species_fig is None:
+        _species_fig = _pyplot().subplots(3, 1, figsize=figsize, sharex=True)
+    fig, ax = _species_fig
+    for a in ax:
+        a.clear()
+    return fig, ax
+
+def _release_species_figure() -> None:
+    global _species_fig
+    if _species_fig is not None:
+        _pyplot().close(_species_fig[0])
+        _species_fig = None
+
+
+def _render_one_species(task) -> str:
+    """Render one species figure (runs in a worker process); returns the PNG path."""
+    key, name, sub_g, outdir, stamp, figsize, dpi = task
+    fig, ax = _species_figure(figsize)
+    day = _f32(sub_g["day"])
+
+    # (1) ONLY N
+    ax[0].plot(day, _f32(sub_g["n"]), label=f"N — {name}", linewidth=2.0, rasterized=True)
+    ax[0].set_ylabel("Count")
+    ax[0].legend(loc="best")
+    ax[0].grid(alpha=0.25)
+
+    # (2) Speed & Size
+    if _plot_columns(ax[1], sub_g, ("avg_speed", "avg_size"), ("Speed", "Size"), rasterized=True):
+        ax[1].legend(loc="best")
+    ax[1].set_ylabel("Trait value")
+    ax[1].grid(alpha=0.25)
+
+    # (3) Sense
+    if "avg_sense" in sub_g.columns:
+        ax[2].plot(day, _f32(sub_g["avg_sense"]), color="tab:purple", label="Sense", rasterized=True)
+        ax[2].legend(loc="best")
+    ax[2].set_xlabel("Day")
+    ax[2].set_ylabel("Sense")
+    ax[2].grid(alpha=0.25)
+
+    fig.suptitle(f"Species {key} — {name}")
+    fig.tight_layout()
+    png = os.path.join(outdir, f"species_{key}_trends_{stamp}.png")
+    fig.savefig(png, dpi=dpi, **PNG_SAVE_KW)
+    return png
+
+
+def plot_species(df_species: pd.DataFrame, outdir: str, stamp: str,
+                 figsize: tuple[float, float] = DEFAULT_FIGSIZE,
+                 dpi: int = DEFAULT_DPI):
+    """Species figures: N only (top), Speed&Size, Sense. One PNG per species, rendered in parallel."""
     if df_species is None or len(df_species) == 0:
         print("[INFO] No species CSV provided or rows = 0; skipping per‑species plots.")
         return
@@ -160,112 +445,122 @@ def plot_species(df_species: pd.DataFrame, outdir: str, tag: str | None):
         print(f"[WARN] df_species missing required columns {needed - set(df_species.columns)}; skipping species plots.")
         return
 
-    for col in ("day", "n", "avg_speed", "avg_size", "avg_sense"):
-        if col in df_species.columns:
-            df_species[col] = pd.to_numeric(df_species[col], errors="coerce")
-
     group_key = "species_id" if "species_id" in df_species.columns else (
                 "species_name" if "species_name" in df_species.columns else None)
     if group_key is None:
         print("[WARN] No species identifier column (species_id/species_name); skipping species plots.")
         return
 
-    for key, sub in df_species.groupby(group_key):
-        agg = {"n": "mean"}
-        if "avg_speed" in sub.columns: agg["avg_speed"] = "mean"
-        if "avg_size"  in sub.columns: agg["avg_size"]  = "mean"
-        if "avg_sense" in sub.columns: agg["avg_sense"] = "mean"
-
-        sub_g = (sub.groupby("day", as_index=False)
-                    .agg(agg)
-                    .sort_values("day"))
-
-        # Display name
-        if "species_name" in sub.columns and pd.notna(sub["species_name"].iloc[0]):
-            name = str(sub["species_name"].iloc[0])
-        else:
-            name = f"{group_key}={key}"
-
-        fig, ax = plt.subplots(3, 1, figsize=(10, 11), sharex=True)
-
-        # (1) ONLY N
-        ax[0].plot(sub_g["day"], sub_g["n"], label=f"N — {name}", linewidth=2.0)
-        ax[0].set_ylabel("Count")
-        ax[0].legend(loc="best")
-        ax[0].grid(alpha=0.25)
-
-        # (2) Speed & Size
-        drawn = False
-        if "avg_speed" in sub_g.columns:
-            ax[1].plot(sub_g["day"], sub_g["avg_speed"], label="Speed")
-            drawn = True
-        if "avg_size" in sub_g.columns:
-            ax[1].plot(sub_g["day"], sub_g["avg_size"],  label="Size")
-            drawn = True
-        if drawn:
-            ax[1].legend(loc="best")
-        ax[1].set_ylabel("Trait value")
-        ax[1].grid(alpha=0.25)
-
-        # (3) Sense
-        if "avg_sense" in sub_g.columns:
-            ax[2].plot(sub_g["day"], sub_g["avg_sense"], color="tab:purple", label="Sense")
-            ax[2].legend(loc="best")
-        ax[2].set_xlabel("Day")
-        ax[2].set_ylabel("Sense")
-        ax[2].grid(alpha=0.25)
-
-        fig.suptitle(f"Species {key} — {name}")
-        fig.tight_layout()
-        png = os.path.join(outdir, f"species_{key}_trends_{timestamp(tag)}.png")
-        fig.savefig(png, dpi=160)
-        plt.close(fig)
+    # One (species, day) aggregation for all species; each species is then a slice of it
+    cols = [c for c in ("n", "avg_speed", "avg_size", "avg_sense") if c in df_species.columns]
+    g_all = (df_species.groupby([group_key, "day"], sort=True, observed=True)[cols]
+                       .mean().reset_index())
+    per_species = dict(iter(g_all.groupby(group_key, sort=False, observed=True)))
+
+    tasks = []
+    firsts = df_species.drop_duplicates(group_key)   # first row of each species, in file order
+    names = firsts["species_name"] if "species_name" in firsts.columns else [None] * len(firsts)
+    for key, first_name in zip(firsts[group_key], names):
+        if key not in per_species:   # NaN id
+            continue
+        name = str(first_name) if pd.notna(first_name) else f"{group_key}={key}"
+        tasks.append((key, name, per_species[key], outdir, stamp, figsize, dpi))
+
+    # Figures are independent: each worker process rasterizes its own PNGs (Agg, headless)
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            pngs = list(ex.map(_render_one_species, tasks))
+    else:
+        pngs = [_render_one_species(t) for t in tasks]
+        _release_species_figure()
+    for png in pngs:
         print(f"[OK] Saved {png}")
 
 
 # ------------------------- exports ---------------------------
-def export_csv(df: pd.DataFrame, outdir: str, base: str, tag: str | None) -> str:
-    ensure_dir(outdir)
-    fname = f"{base}_{timestamp(tag)}.csv"
+def export_csv(df: pd.DataFrame, outdir: str, base: str, stamp: str) -> str:
+    fname = f"{base}_{stamp}.csv"
     path = os.path.join(outdir, fname)
     df.to_csv(path, index=False)
     print(f"[OK] Wrote {path}")
     return path
 
 
-def clean_overall(df_overall: pd.DataFrame) -> pd.DataFrame:
-    # Cast numerics
-    for col in ("day","n","alive_end","ate0","ate1","ate2p",
-                "avg_speed","avg_size","avg_sense","avg_metabolism",
-                "food_per_day","day_steps"):
-        if col in df_overall.columns:
-            df_overall[col] = pd.to_numeric(df_overall[col], errors="coerce")
+def _numba_groupby_mean(df: pd.DataFrame, keys: list[str], cols: list[str]) -> pd.DataFrame:
+    """groupby(keys, sort=False)[cols].mean().reset_index() via _gb_mean_kernel."""
+    codes = np.zeros(len(df), dtype=np.int64)
+    for k in keys:
+        kc, uniq = pd.factorize(df[k], sort=False)
+        # mixed-radix combine; a NaN key (-1) drops the row, as groupby's dropna does
+        codes = np.where((codes < 0) | (kc < 0), -1, codes * len(uniq) + kc)
+    rows = np.flatnonzero(codes >= 0)
+    codes, _ = pd.factorize(codes[rows], sort=False)   # dense, first-appearance order
+    _, first = np.unique(codes, return_index=True)
+
+    vals = np.ascontiguousarray(df[cols].iloc[rows].to_numpy(dtype=np.float64, na_value=np.nan))
+    means = _gb_mean_kernel(codes, vals, len(first))
+
+    out = df[keys].iloc[rows[first]].reset_index(drop=True)
+    for j, c in enumerate(cols):
+        out[c] = means[:, j].astype(np.float32 if df[c].dtype == np.float32 else np.float64)
+    return out
 
+
+def groupby_mean(df: pd.DataFrame, keys: list[str], cols: list[str]) -> pd.DataFrame:
+    """Mean of `cols` per `keys` (keys back as columns); numba kernel for large frames."""
+    if HAVE_NUMBA and len(df) >= NUMBA_GROUPBY_MIN_ROWS:
+        return _numba_groupby_mean(df, keys, cols)
+    return df.groupby(keys, sort=False, observed=True)[cols].mean().reset_index()
+
+
+def downcast(df: pd.DataFrame) -> pd.DataFrame:
+    """float64 -> float32 and int64 -> int32 in one astype (counts/day fit, traits need no more)."""
+    narrow = {c: ("float32" if t == "float64" else "int32")
+              for c, t in df.dtypes.items() if t in ("float64", "int64")}
+    return df.astype(narrow) if narrow else df
+
+
+def clean_overall(df_overall: pd.DataFrame) -> pd.DataFrame:
     if "session_id" in df_overall.columns:
         keep = [c for c in ("n","alive_end","ate0","ate1","ate2p",
                             "avg_speed","avg_size","avg_sense","avg_metabolism",
                             "food_per_day","day_steps") if c in df_overall.columns]
-        d = df_overall.groupby("day", as_index=False)[keep].mean()
-        return d.sort_values("day")
-    return df_overall.sort_values("day") if "day" in df_overall.columns else df_overall.copy()
+        d = groupby_mean(df_overall, ["day"], keep)
+        return downcast(d.sort_values("day"))
+    return downcast(df_overall.sort_values("day") if "day" in df_overall.columns else df_overall)
 
 
 def clean_species(df_species: pd.DataFrame | None) -> pd.DataFrame:
     if df_species is None or len(df_species) == 0:
         return pd.DataFrame()
-    for col in ("day","n","alive_end","ate0","ate1","ate2p",
-                "avg_speed","avg_size","avg_sense","metabolism"):
-        if col in df_species.columns:
-            df_species[col] = pd.to_numeric(df_species[col], errors="coerce")
     keep = [c for c in ("n","alive_end","ate0","ate1","ate2p",
                         "avg_speed","avg_size","avg_sense","metabolism") if c in df_species.columns]
     keys = [k for k in ("species_id","species_name","day") if k in df_species.columns]
-    d = df_species.groupby(keys, as_index=False)[keep].mean()
-    return d.sort_values(keys)
+    d = groupby_mean(df_species, keys, keep)
+    return downcast(d.sort_values(keys))
+
+
+def prepare_frames(df_raw: pd.DataFrame | None, sid: str | None, clean):
+    """
+    Loaded frame -> (rows of session `sid`, clean(rows)): the single filter + aggregation
+    pass whose outputs the exporters and plotters share. No filter when `sid` is None or
+    the rows were already streamed for that session.
+    """
+    df = df_raw
+    if sid is not None and df is not None and "session_id" in df.columns:
+        mask = df["session_id"] == sid
+        if not mask.all():
+            df = df.loc[mask]
+    return df, clean(df)
 
 
 # ------------------------- main ------------------------------
-def main():
+def main(argv: list[str] | None = None):
+    """
+    CLI entry point; `argv` (default sys.argv[1:]) lets launchers run the analysis
+    in-process. Returns the exit status (1: overall CSV missing) instead of exiting.
+    """
     ap = argparse.ArgumentParser()
     ap.add_argument("--overall", type=str, default="runs/ui_daily.csv",
                     help="Path to overall daily CSV written by the UI")
@@ -277,63 +572,104 @@ def main():
                     help="Optional label to append to filenames (e.g., 'demo')")
     ap.add_argument("--session", type=str, default="",
                     help="Session ID to analyze; use 'latest' to pick the most recent session automatically.")
-    args = ap.parse_args()
-
-    df_overall_raw, df_species_raw = load_csvs(args.overall, args.species if args.species else None)
-
-    # Filter by session if requested
-    df_overall = df_overall_raw.copy()
-    df_species = df_species_raw.copy() if df_species_raw is not None else None
+    ap.add_argument("--fast-io", action="store_true",
+                    help="Read CSVs with pyarrow's multithreaded parser (falls back to pandas if unavailable)")
+    ap.add_argument("--dpi", type=int, default=DEFAULT_DPI,
+                    help="Resolution of saved PNGs")
+    ap.add_argument("--figsize", type=parse_figsize, default=DEFAULT_FIGSIZE,
+                    help="Figure size in inches as WIDTH,HEIGHT (e.g., 10,9)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="Ignore caches: re-parse the CSVs (no <csv>.parquet) and redraw every figure. "
+                         "The <csv>.parquet cache is only written by runs without --session")
+    ap.add_argument("--no-plots", action="store_true",
+                    help="Only export the summary CSVs (matplotlib is never imported)")
+    args = ap.parse_args(argv)
+
+    # One stamp for every file of this run so the outputs form a matching set
+    run_time = timestamp()
+    run_ts = timestamp(args.tag or None, run_time)
+
+    # A session id is filtered while reading, so memory scales with the session, not the log;
+    # 'latest' is resolved from the file's tail first (falls back to the loaded frame below)
+    stream_sid = args.session or None
+    if stream_sid == "latest":
+        stream_sid = latest_session_id(args.overall)
+    try:
+        df_overall_raw, df_species_raw = load_csvs(args.overall, args.species if args.species else None,
+                                                   fast_io=args.fast_io, session=stream_sid,
+                                                   use_cache=not args.no_cache)
+    except FileNotFoundError:
+        return 1   # load_csvs printed what is missing
 
     effective_outdir = args.outdir  # may change below
+    sid = None
 
     if args.session:
-        if "session_id" not in df_overall.columns:
+        if "session_id" not in df_overall_raw.columns:
             print("[WARN] --session provided but overall CSV has no session_id; ignoring.")
         else:
             sid = args.session
             if sid == "latest":
-                sid = _latest_session_id(df_overall_raw)   # resolve from raw (unfiltered)
+                sid = stream_sid or _latest_session_id(df_overall_raw)   # resolve from raw (unfiltered)
             if sid:
-                # Filter frames
-                df_overall = df_overall[df_overall["session_id"] == sid].copy()
-                if df_species is not None and "session_id" in df_species.columns:
-                    df_species = df_species[df_species["session_id"] == sid].copy()
                 print(f"[OK] Filtering analysis to session_id={sid}")
                 # -------- Outdir per session --------
                 effective_outdir = os.path.join(args.outdir, sid)
-                ensure_dir(effective_outdir)
                 print(f"[INFO] Writing plots/CSVs under: {effective_outdir}")
             else:
                 print("[WARN] Could not resolve latest session_id; analyzing all data.")
 
     # If still no per-session outdir (no --session), create a timestamped subfolder
     if effective_outdir == args.outdir:
-        stamp_dir = time.strftime("%Y%m%d_%H%M%S")
+        stamp_dir = run_time
         effective_outdir = os.path.join(args.outdir, stamp_dir)
-        ensure_dir(effective_outdir)
         print(f"[INFO] No session filter; writing under timestamped folder: {effective_outdir}")
 
+    # The only mkdir of the run: exporters and plotters assume the folder exists
+    ensure_dir(effective_outdir)
+
+    # Filter + aggregate once; exports and plots all read these frames
+    df_overall, df_overall_clean = prepare_frames(df_overall_raw, sid, clean_overall)
+    df_species, df_species_clean = prepare_frames(df_species_raw, sid, clean_species)
+
     print(f"[INFO] Overall rows after filter: {len(df_overall)}")
     if df_species is not None:
         print(f"[INFO] Species rows after filter: {len(df_species)}")
 
     # Export cleaned CSVs (to per-run folder)
-    df_overall_clean = clean_overall(df_overall)
-    export_csv(df_overall_clean, effective_outdir, base="overall_summary", tag=(args.tag or None))
-
-    df_species_clean = clean_species(df_species)
+    export_csv(df_overall_clean, effective_outdir, base="overall_summary", stamp=run_ts)
     if args.species and args.species.strip() and len(df_species_clean) > 0:
-        export_csv(df_species_clean, effective_outdir, base="species_summary", tag=(args.tag or None))
+        export_csv(df_species_clean, effective_outdir, base="species_summary", stamp=run_ts)
 
-    # Plots (to per-run folder)
-    plot_overall(df_overall, df_species, effective_outdir, tag=(args.tag or None))
-    if args.species and args.species.strip() and df_species is not None and len(df_species) > 0:
-        plot_species(df_species, effective_outdir, tag=(args.tag or None))
+    if args.no_plots:
+        print("[INFO] --no-plots: skipping figures.")
     else:
-        print("[INFO] No per‑species rows to plot (after optional --session filter); skipping species plots.")
+        # Plots (to per-run folder); skipped when this folder already holds figures of identical data.
+        # Only a per-session folder is ever revisited: a timestamped one is new, so don't hash for it.
+        settings = (args.figsize, args.dpi)
+        gated = sid is not None
+        overall_key = frame_hash(df_overall_clean, frame_hash(df_species_clean), *settings) if gated else None
+        if gated and not args.no_cache and plots_cached(effective_outdir, "overall", overall_key, "overall_trends_*.png"):
+            print("[INFO] Overall data unchanged since last run; keeping existing overall plot (--no-cache to redraw).")
+        else:
+            plot_overall(df_overall_clean, df_species_clean, effective_outdir, stamp=run_ts,
+                         figsize=args.figsize, dpi=args.dpi)
+            if gated:
+                store_plot_hash(effective_outdir, "overall", overall_key)
+        if args.species and args.species.strip() and df_species is not None and len(df_species) > 0:
+            species_key = frame_hash(df_species_clean, *settings) if gated else None
+            if gated and not args.no_cache and plots_cached(effective_outdir, "species", species_key, "species_*_trends_*.png"):
+                print("[INFO] Species data unchanged since last run; keeping existing species plots (--no-cache to redraw).")
+            else:
+                plot_species(df_species_clean, effective_outdir, stamp=run_ts,
+                             figsize=args.figsize, dpi=args.dpi)
+                if gated:
+                    store_plot_hash(effective_outdir, "species", species_key)
+        else:
+            print("[INFO] No per‑species rows to plot (after optional --session filter); skipping species plots.")
 
     print(f"\nDone. Outputs are in: {effective_outdir}")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
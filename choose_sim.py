@@ -7,6 +7,7 @@ Interactive launcher that runs either:
 You can run it fully interactive (just `python choose_sim.py`) or non-interactively:
   python choose_sim.py --mode full --tag demo
   python choose_sim.py --mode ns   --tag demo
+  (add --isolated to run the analysis in its own interpreter)
 
 Notes:
 - For NS mode, make sure your package folder is named:  ns_sim_2_0
@@ -17,8 +18,8 @@ import argparse
 import subprocess
 import sys
 import os
-import csv
-from pathlib import Path
+
+from session_log import latest_session_id
 
 # --------------- helpers ---------------
 
@@ -38,21 +39,8 @@ def prompt_str(prompt, default=""):
     s = input(f"{prompt} [{default}]: ").strip()
     return s if s else default
 
-def latest_session_id(overall_csv_path: str) -> str | None:
-    """Return the last session_id in file order from a UI daily CSV."""
-    p = Path(overall_csv_path)
-    if not p.exists():
-        return None
-    last_sid = None
-    with p.open(newline="") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            sid = row.get("session_id")
-            if sid:
-                last_sid = sid
-    return last_sid
-
-def run_and_analyze(ui_cmd: list[str], overall_csv: str, species_csv: str, outdir: str, tag: str):
+def run_and_analyze(ui_cmd: list[str], overall_csv: str, species_csv: str, outdir: str, tag: str,
+                    isolated: bool = False):
     # 1) Run UI (blocks until window closes)
     print("[launcher] Starting UI:", " ".join(ui_cmd))
     ret = subprocess.call(ui_cmd)
@@ -65,8 +53,7 @@ def run_and_analyze(ui_cmd: list[str], overall_csv: str, species_csv: str, outdi
         print(f"[launcher] Could not resolve latest session_id from {overall_csv}; did a day complete?")
         sys.exit(0)
 
-    ana_cmd = [
-        sys.executable, "analyze_ui_csv.py",
+    ana_args = [
         "--overall", overall_csv,
         "--species", species_csv,
         "--outdir", outdir,
@@ -74,8 +61,18 @@ def run_and_analyze(ui_cmd: list[str], overall_csv: str, species_csv: str, outdi
         "--session", sid
     ]
     print("\n[launcher] Analyzing session:", sid)
-    print("[launcher] Running:", " ".join(ana_cmd))
-    sys.exit(subprocess.call(ana_cmd))
+    if isolated:
+        ana_cmd = [sys.executable, "analyze_ui_csv.py", *ana_args]
+        print("[launcher] Running:", " ".join(ana_cmd))
+        sys.exit(subprocess.call(ana_cmd))
+
+    # In-process: no second interpreter start-up; pandas/numpy load only now, after the UI
+    from analyze_ui_csv import main as analyze_main
+    print("[launcher] Running: analyze_ui_csv", " ".join(ana_args))
+    rc = analyze_main(ana_args)
+    if rc:
+        print(f"[launcher] Analysis failed (exit status {rc}).", file=sys.stderr)
+    sys.exit(rc)
 
 # --------------- main ---------------
 
@@ -85,6 +82,8 @@ def main():
                     help="full = evo_sim UI; ns = ns_sim_2_0 UI")
     ap.add_argument("--tag", type=str, default="")
     ap.add_argument("--outdir", type=str, default="reports")
+    ap.add_argument("--isolated", action="store_true",
+                    help="run the analysis in a separate Python process")
     # Let users pass additional args to the UI modules if they like:
     args, passthru = ap.parse_known_args()
 
@@ -98,7 +97,7 @@ def main():
         ui_cmd = [sys.executable, "-m", "evo_sim.main", "--ui", *passthru]
         overall_csv = "runs/ui_daily.csv"
         species_csv = "runs/ui_species_daily.csv"
-        return run_and_analyze(ui_cmd, overall_csv, species_csv, outdir, tag)
+        return run_and_analyze(ui_cmd, overall_csv, species_csv, outdir, tag, args.isolated)
 
     else:
         # NS (ns_sim_2_0) — UI then analyze
@@ -106,7 +105,7 @@ def main():
         ui_cmd = [sys.executable, "-m", "ns_sim_2_0.main", "--ui", *passthru]
         overall_csv = "runs_ns/ui_daily.csv"
         species_csv = "runs_ns/ui_species_daily.csv"
-        return run_and_analyze(ui_cmd, overall_csv, species_csv, outdir, tag)
+        return run_and_analyze(ui_cmd, overall_csv, species_csv, outdir, tag, args.isolated)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,7 @@
 # evo_sim/main.py
 from __future__ import annotations
 import argparse
+from contextlib import nullcontext
 from typing import List
 
 from .sim.config import SIM, WORLD
@@ -9,7 +10,7 @@ from .sim.models import Creature, Species
 from .sim.world import World
 from .sim.engine import simulate_day, end_of_day_selection
 from .sim.genetics import reproduce_N_children
-from .sim.metrics import summarize_day, append_csv
+from .sim.metrics import summarize_day, CsvAppender
 from .ui.app import run_ui  # UI entry (unchanged)
 
 def _seed_species():
@@ -57,47 +58,44 @@ def run():
     next_id = max(c.id for c in population) + 1
     next_species_id = max(c.species.id for c in population) + 1
 
-    for day in range(1, args.days + 1):
-        simulate_day(world, population)
-        survivors, repro_orders = end_of_day_selection(population)
+    # One handle for the whole run; rows are buffered and flushed on exit (also on Ctrl-C)
+    with (CsvAppender(args.csv) if args.csv else nullcontext()) as csv_log:
+        for day in range(1, args.days + 1):
+            simulate_day(world, population)
+            survivors, repro_orders = end_of_day_selection(population)
 
-        summary = summarize_day(day, population)
-        print(
-            f"Day {day:3d} | N={summary['n']:3.0f} "
-            f"alive={summary['alive']:3.0f} ate0={summary['ate0']:3.0f} "
-            f"ate1={summary['ate1']:3.0f} ate2+={summary['ate2p']:3.0f} "
-            f"avg_speed={summary['avg_speed']:.2f} avg_size={summary['avg_size']:.2f} avg_sense={summary['avg_sense']:.2f}"
-        )
-        if args.csv:
-            append_csv(args.csv, summary)
+            summary = summarize_day(day, population)
+            print(
+                f"Day {day:3d} | N={summary['n']:3.0f} "
+                f"alive={summary['alive']:3.0f} ate0={summary['ate0']:3.0f} "
+                f"ate1={summary['ate1']:3.0f} ate2+={summary['ate2p']:3.0f} "
+                f"avg_speed={summary['avg_speed']:.2f} avg_size={summary['avg_size']:.2f} avg_sense={summary['avg_sense']:.2f}"
+            )
+            if csv_log is not None:
+                csv_log.write(summary)
 
-        new_population: List[Creature] = []
-        for s in survivors:
-            new_population.append(Creature(
-                id=s.id, species=s.species,
-                speed=s.speed, size=s.size, sense=s.sense,
-                x=0.0, y=0.0, home=(0.0,0.0), energy=0.0,
-                hungry_streak=s.hungry_streak
-            ))
+            new_population: List[Creature] = survivors
+            for s in survivors:
+                s.reset_for_new_day()
 
-        for parent, num_kids in repro_orders:
-            kids, next_id, next_species_id, _events = reproduce_N_children(
-                parent=parent, n_offspring=num_kids,
-                next_creature_id=next_id, next_species_id=next_species_id,
-                mutate_speed=True, mutate_size=True, mutate_sense=True
-            )
-            new_population.extend(kids)
+            for parent, num_kids in repro_orders:
+                kids, next_id, next_species_id, _events = reproduce_N_children(
+                    parent=parent, n_offspring=num_kids,
+                    next_creature_id=next_id, next_species_id=next_species_id,
+                    mutate_speed=True, mutate_size=True, mutate_sense=True
+                )
+                new_population.extend(kids)
 
-        if len(new_population) == 0:
-            new_population = init_population(args.pop, start_id=next_id, seed=args.seed)
-            next_id = max(c.id for c in new_population) + 1
-            next_species_id = max(c.species.id for c in new_population) + 1
+            if len(new_population) == 0:
+                new_population = init_population(args.pop, start_id=next_id, seed=args.seed)
+                next_id = max(c.id for c in new_population) + 1
+                next_species_id = max(c.species.id for c in new_population) + 1
 
-        population = new_population
+            population = new_population
 
-        if args.plot:
-            # optional snapshot (you can re-enable visualize if desired)
-            pass
+            if args.plot:
+                # optional snapshot (you can re-enable visualize if desired)
+                pass
 
 if __name__ == "__main__":
     run()
\ No newline at end of file
@@ -1,19 +1,22 @@
 # evo_sim/sim/behaviors.py
 from __future__ import annotations
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import math
 
-from .models import Creature
-from .config import TRAITS, BEHAV, WORLD, ENERGY, RISK
+import numpy as np
+
+from .models import (Creature, HERBIVORE, OMNIVORE, CARNIVORE,
+                     CAN_EAT, EAT_UP_TO_1_4X, EAT_IF_1_2X_LARGER)
+from .config import TRAITS, BEHAV, WORLD, ENERGY, RISK, PREY_AVOID
 from .rng import RNG
-from .world import World
-from .config import PREY_AVOID
+from .world import World, Snapshot
+from . import kernels
 
 Vec = Tuple[float, float]
 
 # --- Predator density avoidance (prey) knobs ---
-AVOID_RADIUS_MULT = getattr(PREY_AVOID, "radius_mult", 1.6)
-AVOID_MIN_COUNT   = getattr(PREY_AVOID, "min_count",   2)
+AVOID_RADIUS_MULT = PREY_AVOID.radius_mult
+AVOID_MIN_COUNT   = PREY_AVOID.min_count
 # --- Hungry-predator bravery knobs ---
 HUNGRY_STREAK_FOR_BRAVERY = 1        # when >= 1, get “braver”
 HUNGRY_PKILL_BONUS        = 0.10     # +10% absolute bump to perceived p_kill (clamped in [min,max])
@@ -21,6 +24,21 @@ HUNGRY_PREY_RADIUS_MULT   = 1.15     # slightly wider prey pursuit radius
 HUNGRY_MIN_SCORE          = 0.005    # lower chase threshold (was ~0.02)
 BASE_MIN_SCORE            = 0.02
 
+# Frozen config values read on every step, bound once
+_C_MOVE  = float(ENERGY.C_move)
+_C_SIZE  = float(ENERGY.C_size)
+_C_SENSE = float(ENERGY.C_sense)
+_RETURN_ENERGY_MARGIN  = float(BEHAV.return_energy_margin)
+_WANDER_TURN_RATE      = float(BEHAV.wander_turn_rate)
+_WANDER_SPEED_FRACTION = float(BEHAV.wander_speed_fraction)
+_BASE_P_KILL  = float(RISK.base_p_kill)
+_SIZE_WEIGHT  = float(RISK.size_weight)
+_SPEED_WEIGHT = float(RISK.speed_weight)
+_MIN_P_KILL   = float(RISK.min_p_kill)
+_MAX_P_KILL   = float(RISK.max_p_kill)
+
+_CAN_EAT_ROWS = np.array(CAN_EAT, dtype=np.int8)
+
 # ---------------- vector helpers ----------------
 def _unit(v: Vec) -> Vec:
     x, y = v
@@ -38,17 +56,21 @@ def bite_radius(c: Creature) -> float:
     return WORLD.bite_radius_scale * c.size
 
 def _sense_radii(me: Creature):
+    cached = me._sense_radii_cache
+    if cached is not None:
+        return cached
     s = me.sense
     r_food = s * TRAITS.sense_food_scale
     r_pred = s * TRAITS.sense_pred_scale
     r_prey = s * TRAITS.sense_prey_scale
     # species modifiers
-    r_prey *= (1.0 + 0.5 * max(0.0, min(1.0, me.species.aggression)))         # aggression → expand prey radius
-    r_pred *= (1.0 + 0.5 * max(0.0, min(1.0, (1.0 - me.species.bravery))))    # low bravery → expand predator radius
+    r_prey *= me.species.prey_radius_mult   # aggression → expand prey radius
+    r_pred *= me.species.pred_radius_mult   # low bravery → expand predator radius
     # (Optional) tiny herbivore boost to plant detection; safe to keep
-    if me.species.diet.lower() == "herbivore":
+    if me.species.diet_code == HERBIVORE:
         r_food *= 1.10
-    return r_food, r_pred, r_prey
+    me._sense_radii_cache = (r_food, r_pred, r_prey)
+    return me._sense_radii_cache
 
 # ---------------- diet-specific predation rules ----------------
 def can_eat(pred: Creature, prey: Creature) -> bool:
@@ -59,40 +81,78 @@ def can_eat(pred: Creature, prey: Creature) -> bool:
       - Omnivore: must be >= 1.2x larger than prey (pred.size >= 1.2 * prey.size)
     Herbivores never hunt.
     """
-    pred_diet = pred.species.diet.lower()
-    prey_diet = prey.species.diet.lower()
-
-    if pred_diet == "herbivore":
-        return False
+    rule = CAN_EAT[pred.species.diet_code][prey.species.diet_code]
+    if rule == EAT_UP_TO_1_4X:
+        # carnivore: herbivores or omnivores up to 1.4x larger
+        return prey.size <= 1.4 * pred.size
+    if rule == EAT_IF_1_2X_LARGER:
+        # omnivore: herbivores or omnivores only if >= 1.2x larger
+        return pred.size >= 1.2 * prey.size
+    return False
 
-    # Forbid carnivore-on-carnivore; allow eating omnivores
-    if prey_diet == "carnivore":
-        return False
+def can_eat_row(pred: Creature) -> np.ndarray:
+    """pred's CAN_EAT row as an int8 array, indexable by a snapshot's diet codes."""
+    return _CAN_EAT_ROWS[pred.species.diet_code]
 
-    if pred_diet == "carnivore":
-        # can eat herbivores or omnivores up to 1.4x larger
-        return prey.size <= 1.4 * pred.size
+def _edible_mask(pred: Creature, snap: Snapshot) -> np.ndarray:
+    """can_eat(pred, o) for every o in the snapshot, as a bool array."""
+    rule = can_eat_row(pred)[snap.diet]
+    return (((rule == EAT_UP_TO_1_4X) & (snap.sizes <= 1.4 * pred.size))
+            | ((rule == EAT_IF_1_2X_LARGER) & (pred.size >= 1.2 * snap.sizes)))
 
-    if pred_diet == "omnivore":
-        # can eat herbivores or omnivores only if >= 1.2x larger
-        return pred.size >= 1.2 * prey.size
+def last_argmin(a: np.ndarray) -> int:
+    """Index of the LAST minimum (a sequential `<=` scan keeps the last of equal values)."""
+    return len(a) - 1 - int(np.argmin(a[::-1]))
 
-    return False
+def _scan_neighbors(snap: Snapshot, me: Creature, mx: float, my: float, threat_size: float,
+                    r_pred2: float, want_avoid: bool, avoid_r2: float, want_hunt: bool, prey_r2: float):
+    """
+    numpy twin of kernels.scan_neighbors: one distance pass feeding all three scans.
+    Returns (nearest threat index or -1, cluster sum x, sum y, cluster count, prey indices).
+    """
+    dx = snap.xs - mx
+    dy = snap.ys - my
+    d2 = dx * dx + dy * dy
+    live_others = snap.alive & (snap.ids != me.id)
+
+    threat = live_others & (snap.sizes >= threat_size) & (d2 <= r_pred2)
+    j = last_argmin(np.where(threat, d2, np.inf)) if threat.any() else -1
+
+    cx = cy = 0.0
+    cnt = 0
+    if want_avoid:
+        near = live_others & (snap.diet != HERBIVORE) & (d2 <= avoid_r2)
+        cnt = int(np.count_nonzero(near))
+        # sequential sums (not numpy's pairwise ones) keep the centroid bit-identical
+        cx = sum(snap.xs[near].tolist())
+        cy = sum(snap.ys[near].tolist())
+
+    if want_hunt:
+        prey_idx = np.flatnonzero(live_others & _edible_mask(me, snap) & (d2 <= prey_r2))
+    else:
+        prey_idx = np.empty(0, dtype=np.int64)
+    return j, cx, cy, cnt, prey_idx
 
 # ---------------- risk scoring used for chase prioritization ----------------
-def _kill_probability(pred: Creature, prey: Creature) -> float:
-    size_ratio = pred.size / max(1e-6, prey.size)
+def kill_probability(pred: Creature, prey: Creature) -> float:
+    prey_size = prey.size
+    size_ratio = pred.size / (prey_size if prey_size > 1e-6 else 1e-6)
     speed_adv = pred.speed - prey.speed
-    p = (float(RISK.base_p_kill)
-         + float(RISK.size_weight) * (size_ratio - 1.0)
-         + float(RISK.speed_weight) * (speed_adv / 6.0))
-    return max(float(RISK.min_p_kill), min(float(RISK.max_p_kill), p))
+    p = (_BASE_P_KILL
+         + _SIZE_WEIGHT * (size_ratio - 1.0)
+         + _SPEED_WEIGHT * (speed_adv / 6.0))
+    # clamp to [_MIN_P_KILL, _MAX_P_KILL] without two builtin calls
+    return _MIN_P_KILL if p < _MIN_P_KILL else (_MAX_P_KILL if p > _MAX_P_KILL else p)
 
 # ---------------- main behavior ----------------
-def step_behavior(world: World, me: Creature, others: List[Creature], dt: float, steps_left: int) -> Vec:
+def step_behavior(world: World, me: Creature, others: List[Creature], dt: float, steps_left: int,
+                  snap: Optional[Snapshot] = None) -> Vec:
     """
     Decide velocity vector for current step.
 
+    `snap` is World.snapshot(others) taken at the start of the step; the neighbor
+    scans run as array masks over it. Built on the fly when not given.
+
     Includes:
       - Speed-aware, energy-aware return-home.
       - Herbivore reproduction-first logic with home-biased foraging after first food;
@@ -104,17 +164,17 @@ def step_behavior(world: World, me: Creature, others: List[Creature], dt: float,
         return (0.0, 0.0)
 
     # Bind diet EARLY so it's available in all branches
-    diet = me.species.diet.lower()
+    diet = me.species.diet_code
     # If we already have 3+ foods, commit to going home immediately
     if me.eaten >= 3:
         me.going_home = True
 
     eff_speed = me.effective_speed()
-    Cmove  = float(ENERGY.C_move)
-    Csize  = float(ENERGY.C_size)
-    Csense = float(ENERGY.C_sense)
-
     r_food, r_pred, r_prey = _sense_radii(me)
+    # Loop-invariant locals for the scans below (me doesn't move while deciding)
+    mx, my = me.x, me.y
+    r_pred2 = r_pred * r_pred
+    threat_size = 1.2 * me.size
 
     # ---------- Step-aware & energy-aware return-home ----------
     dxh, dyh = (me.home[0] - me.x, me.home[1] - me.y)
@@ -126,7 +186,7 @@ def step_behavior(world: World, me: Creature, others: List[Creature], dt: float,
     # (A) Step gate:
     # - Herbivores: repro-first; after 1 food, stricter time gate; after 2, prefer home unless safe to try for 3.
     # - Others: gentle 5% grace.
-    if diet == "herbivore":
+    if diet == HERBIVORE:
         if me.eaten >= 3:
             me.going_home = True
         elif me.eaten == 2:
@@ -145,33 +205,58 @@ def step_behavior(world: World, me: Creature, others: List[Creature], dt: float,
 
     # (B) Energy gate (applies to all)
     t_home = dist_home / max(eff_speed, 1e-6)
-    move_cost  = Cmove  * (me.size ** 3) * (eff_speed ** 2) * t_home
-    base_cost  = Csize  * (me.size ** 3) * t_home
-    sense_cost = Csense * me.sense        * t_home
-    need = (move_cost + base_cost + sense_cost) * float(BEHAV.return_energy_margin)
+    size3 = me.size ** 3   # pow(), not size*size*size: the two can round differently
+    move_cost  = _C_MOVE  * size3 * (eff_speed ** 2) * t_home
+    base_cost  = _C_SIZE  * size3 * t_home
+    sense_cost = _C_SENSE * me.sense        * t_home
+    need = (move_cost + base_cost + sense_cost) * _RETURN_ENERGY_MARGIN
     if me.energy <= need:
         me.going_home = True
 
     # (C) Food-completion gates (non-herbivores keep original behavior)
-    if diet != "herbivore":
+    if diet != HERBIVORE:
         if me.eaten >= 2:
             me.going_home = True
     else:
         # already handled >=3 above; at 2 we may still search if safe
         pass
 
-    # ---------- Flee predators (with home-safe override) ----------
-    predator = None
-    best_pd2 = r_pred * r_pred
-    for o in others:
-        if not o.alive or o.id == me.id:
-            continue
-        if o.size >= 1.2 * me.size:
-            d2 = (o.x - me.x)**2 + (o.y - me.y)**2
-            if d2 <= best_pd2:
-                predator = o
-                best_pd2 = d2
+    # ---------- Which neighbor scans this step can use ----------
+    # Flee always; avoidance and hunting only when not already heading home.
+    want_avoid = (not me.going_home) and (
+        (diet == HERBIVORE) or (diet == OMNIVORE and me.prey_kills_today == 0 and me.eaten == 0))
+    want_hunt = False
+    if (not me.going_home) and me.species.is_predator_diet:
+        # Decide whether we even want to hunt this step
+        want_hunt = (diet == CARNIVORE) or (me.species.aggression > 0.5 or me.eaten == 0)
+        # --- HARD CAP: never hunt once we've made 1 kill today ---
+        if me.prey_kills_today >= 1:
+            want_hunt = False
+    # scan a bit wider than direct-flee radius for predator clusters
+    scan_r = r_pred * AVOID_RADIUS_MULT
+    scan_r2 = scan_r * scan_r
+    # Hungry → “braver”: expand pursuit radius and relax risk threshold
+    hungry = (me.hungry_streak >= HUNGRY_STREAK_FOR_BRAVERY)
+    scan_r_prey = r_prey * (HUNGRY_PREY_RADIUS_MULT if hungry else 1.0)
+    min_score   = HUNGRY_MIN_SCORE if hungry else BASE_MIN_SCORE
+    reach2 = scan_r_prey * scan_r_prey * (1.0 + 1e-9)   # prey prefilter; exact hypot test below
+
+    # ---------- One fused pass over the neighbors: threat, predator cluster, prey ----------
+    if snap is None:
+        snap = world.snapshot(others)
+    # Only grid cells within the widest scan radius (flee, avoid, hungry hunt) can matter
+    reach = max(r_pred * max(1.0, AVOID_RADIUS_MULT), r_prey * max(1.0, HUNGRY_PREY_RADIUS_MULT))
+    snap = snap.around(mx, my, reach * (1.0 + 1e-9))
+    if kernels.HAVE_NUMBA:
+        j, cx, cy, cnt, prey_idx = kernels.scan_neighbors(
+            snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids, snap.diet, mx, my, me.id, me.size,
+            threat_size, r_pred2, want_avoid, scan_r2, want_hunt, can_eat_row(me), reach2)
+    else:
+        j, cx, cy, cnt, prey_idx = _scan_neighbors(
+            snap, me, mx, my, threat_size, r_pred2, want_avoid, scan_r2, want_hunt, reach2)
 
+    # ---------- Flee predators (with home-safe override) ----------
+    predator = snap.creature(j) if j >= 0 else None
     if predator is not None:
         # If we're at home, or essentially home and already returning, do NOT flee—finish return.
         if at_home or (near_home and me.going_home):
@@ -181,7 +266,7 @@ def step_behavior(world: World, me: Creature, others: List[Creature], dt: float,
                 return _mul(_unit(to_home), eff_speed)
             return (0.0, 0.0)  # at_home: hold position
         # Otherwise, flee as usual
-        away = (me.x - predator.x, me.y - predator.y)
+        away = (mx - predator.x, my - predator.y)
         return _mul(_unit(away), eff_speed)
 
     # ---------- Return home (strategic throttling) ----------
@@ -197,34 +282,19 @@ def step_behavior(world: World, me: Creature, others: List[Creature], dt: float,
 
 
     # ---------- NEW: Predator density avoidance for PREY (herbivores) ----------
-    if (diet == "herbivore") or (diet == "omnivore" and me.prey_kills_today == 0 and me.eaten == 0):
-    # same avoidance logic
-        # scan a bit wider than direct-flee radius
-        scan_r = r_pred * AVOID_RADIUS_MULT
-        scan_r2 = scan_r * scan_r
-        cx = cy = 0.0
-        cnt = 0
-        for o in others:
-            if not o.alive or o.id == me.id:
-                continue
-            od = o.species.diet.lower()
-            if od in ("carnivore", "omnivore"):
-                d2 = (o.x - me.x)**2 + (o.y - me.y)**2
-                if d2 <= scan_r2:
-                    cx += o.x; cy += o.y; cnt += 1
-        if cnt >= AVOID_MIN_COUNT:
-            cx /= cnt; cy /= cnt
-            away = (me.x - cx, me.y - cy)
-            ax, ay = _unit(away)
-            # if we have a valid direction, move away from the predator cluster
-            if ax != 0.0 or ay != 0.0:
-                return _mul((ax, ay), eff_speed)
+    if want_avoid and cnt >= AVOID_MIN_COUNT:
+        cx /= cnt; cy /= cnt
+        away = (mx - cx, my - cy)
+        ax, ay = _unit(away)
+        # if we have a valid direction, move away from the predator cluster
+        if ax != 0.0 or ay != 0.0:
+            return _mul((ax, ay), eff_speed)
 
     # ---------- Foraging logic ----------
-    if diet in ("herbivore", "omnivore"):
+    if me.species.is_prey_diet:
         # Home-biased plant foraging for herbivores after 1st (and possibly 2nd) food
         home_bias = 0.0
-        if diet == "herbivore" and me.eaten >= 1:
+        if diet == HERBIVORE and me.eaten >= 1:
             home_bias = 0.35 if me.eaten == 1 else 0.45
 
         f = world.nearest_food_within(me.x, me.y, r_food)
@@ -238,49 +308,62 @@ def step_behavior(world: World, me: Creature, others: List[Creature], dt: float,
                 return _mul(to_food, eff_speed)
 
     # ---------- Predator/omnivore hunting ----------
-    if diet in ("carnivore", "omnivore"):
-        # Decide whether we even want to hunt this step
-        want_hunt = (diet == "carnivore") or (me.species.aggression > 0.5 or me.eaten == 0)
-
-        # --- HARD CAP: never hunt once we've made 1 kill today ---
-        if me.prey_kills_today >= 1:
-            want_hunt = False
-
-        if want_hunt:
-            # Hungry → “braver”: expand pursuit radius and relax risk threshold
-            hungry = (me.hungry_streak >= HUNGRY_STREAK_FOR_BRAVERY)
-            scan_r_prey = r_prey * (HUNGRY_PREY_RADIUS_MULT if hungry else 1.0)
-            min_score   = HUNGRY_MIN_SCORE if hungry else BASE_MIN_SCORE
-
-            candidate = None
-            best_score = -1.0
-
-            for o in others:
-                if not o.alive or o.id == me.id:
-                    continue
-                if not can_eat(me, o):
-                    continue
-
-                # Estimate kill probability
-                p_kill = _kill_probability(me, o)
-                if hungry:
-                    # “bravery” effect: be more willing to engage risky targets
-                    p_kill = max(float(RISK.min_p_kill), min(float(RISK.max_p_kill), p_kill + HUNGRY_PKILL_BONUS))
-
-                d = math.hypot(o.x - me.x, o.y - me.y)
-                if d <= scan_r_prey:
-                    # prefer higher success & nearer targets
-                    score = p_kill / (1.0 + d)
-                    if score > best_score:
-                        best_score = score
-                        candidate = o
-
-            if candidate is not None and best_score >= min_score:
-                to_prey = (candidate.x - me.x, candidate.y - me.y)
-                return _mul(_unit(to_prey), eff_speed)
+    if want_hunt:
+        candidate = None
+        best_score = -1.0
+
+        # Exact hypot test + scoring on the few prefiltered prey
+        for j in prey_idx.tolist():
+            o = snap.creature(j)
+
+            # Estimate kill probability
+            p_kill = kill_probability(me, o)
+            if hungry:
+                # “bravery” effect: be more willing to engage risky targets
+                p_kill += HUNGRY_PKILL_BONUS
+                p_kill = _MIN_P_KILL if p_kill < _MIN_P_KILL else (_MAX_P_KILL if p_kill > _MAX_P_KILL else p_kill)
+
+            d = math.hypot(o.x - mx, o.y - my)
+            if d <= scan_r_prey:
+                # prefer higher success & nearer targets
+                score = p_kill / (1.0 + d)
+                if score > best_score:
+                    best_score = score
+                    candidate = o
+
+        if candidate is not None and best_score >= min_score:
+            to_prey = (candidate.x - mx, candidate.y - my)
+            return _mul(_unit(to_prey), eff_speed)
 
     # ---------- Explore (wander) ----------
-    drift = RNG.uniform(-BEHAV.wander_turn_rate, BEHAV.wander_turn_rate) * dt
+    # One draw per wandering creature, in population order. Not pre-drawn per tick:
+    # which creatures wander is only known here, and a batch would shift the seeded stream.
+    drift = RNG.uniform(-_WANDER_TURN_RATE, _WANDER_TURN_RATE) * dt
     me.heading += drift
-    vmag = BEHAV.wander_speed_fraction * eff_speed
+    vmag = _WANDER_SPEED_FRACTION * eff_speed
     return (math.cos(me.heading) * vmag, math.sin(me.heading) * vmag)
+
+# ---------------- whole-population step ----------------
+def step_tick(world: World, population: List[Creature], dt: float, steps_left: int) -> np.ndarray:
+    """
+    Speed-clamped velocities for every creature this step, as an (N, 2) array
+    aligned with `population` (zeros for the dead).
+
+    Positions are frozen until every velocity is decided, so one snapshot serves
+    the whole population. The decisions stay sequential: they mutate creature
+    state (going_home, heading) and draw from RNG in population order.
+    """
+    snap = world.snapshot(population)
+    vel = np.zeros((len(population), 2))
+    for i, me in enumerate(population):
+        if not me.alive:
+            continue
+        vx, vy = step_behavior(world, me, population, dt, steps_left, snap)
+        vmax = me.effective_speed()
+        spd = math.hypot(vx, vy)
+        if spd > vmax and spd > 1e-12:
+            f = vmax / spd
+            vx *= f; vy *= f
+        vel[i, 0] = vx
+        vel[i, 1] = vy
+    return vel
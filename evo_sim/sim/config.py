@@ -4,7 +4,7 @@ from dataclasses import dataclass
 # ------------------------------------------------------------
 # WORLD / SIMULATION SPATIAL SETTINGS
 # ------------------------------------------------------------
-@dataclass(frozen=False)  # mutable so UI can tweak n_food at runtime
+@dataclass(frozen=False, slots=True)  # mutable so UI can tweak n_food at runtime
 class WorldConfig:
     width: float = 100.0
     height: float = 100.0
@@ -20,18 +20,18 @@ class WorldConfig:
 # ------------------------------------------------------------
 # ENERGY MODEL COEFFICIENTS (matches rules)
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnergyConfig:
-    base_energy=190.0
-    C_size=0.0035
-    C_sense=0.0042
-    C_move=0.0055   # ↓ from 0.0105 (about 30% cheaper to move fast)
+    base_energy: float = 190.0
+    C_size: float = 0.0035
+    C_sense: float = 0.0042
+    C_move: float = 0.0055   # ↓ from 0.0105 (about 30% cheaper to move fast)
 
 
 # ------------------------------------------------------------
 # TRAIT RANGES
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TraitConfig:
     min_speed: float = 0.2
     max_speed: float = 3.0
@@ -46,7 +46,7 @@ class TraitConfig:
 # ------------------------------------------------------------
 # BEHAVIOR TUNING
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BehaviorConfig:
     wander_turn_rate: float = 1.4
     wander_speed_fraction: float = 0.85
@@ -55,7 +55,7 @@ class BehaviorConfig:
 # ------------------------------------------------------------
 # REPRODUCTION / MUTATION
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReproConfig:
     reproduction_offspring: int = 1    # base count (may be overridden per diet rule)
     mutation_rate: float = 0.25        # tune freely
@@ -64,7 +64,7 @@ class ReproConfig:
 # ------------------------------------------------------------
 # SPECIATION
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SpeciationConfig:
     threshold_frac: float = 0.40
     min_metabolism: float = 0.80
@@ -73,7 +73,7 @@ class SpeciationConfig:
 # ------------------------------------------------------------
 # ATTACK RISK / INJURY
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RiskConfig:
     base_p_kill: float = 0.35
     size_weight: float = 0.60
@@ -92,7 +92,7 @@ class RiskConfig:
 # ------------------------------------------------------------
 # PREDATOR AVOIDANCE (PREY BEHAVIOR)
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PreyAvoidConfig:
     radius_mult: float = 1.5   # scan radius relative to r_pred
     min_count:   int   = 2     # number of predators within scan to trigger avoidance
@@ -100,7 +100,7 @@ class PreyAvoidConfig:
 # ------------------------------------------------------------
 # Predator home placement (center of the world)
 # ------------------------------------------------------------
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PredatorHomeConfig:
     # Predators will have homes near the world center (width/2, height/2)
     # You can put them on a small ring around the center to avoid perfect overlap.
@@ -112,7 +112,7 @@ PRED_HOME = PredatorHomeConfig()
 # ------------------------------------------------------------
 # HEADLESS SETTINGS
 # ------------------------------------------------------------
-@dataclass(frozen=False)
+@dataclass(frozen=False, slots=True)
 class SimConfig:
     seed: int = 42
     initial_population: int = 60
@@ -3,46 +3,32 @@ from __future__ import annotations
 from typing import List, Tuple, Optional
 import math
 
-from .models import Creature
-from .world import World
-from .behaviors import step_behavior, bite_radius, can_eat
-from .config import WORLD, ENERGY, RISK
+import numpy as np
+
+from .models import Creature, OMNIVORE, CARNIVORE, EAT_UP_TO_1_4X, EAT_IF_1_2X_LARGER
+from .world import World, Snapshot
+from .spatial import BITE_GRID_MIN_POP
+from .behaviors import step_tick, bite_radius, can_eat, can_eat_row, kill_probability, last_argmin
+from . import kernels
+from .config import WORLD, ENERGY, RISK, TRAITS
 from .rng import RNG
 
+# Frozen config values read on every attack, bound once
+# (WORLD stays a live read: the UI edits it at runtime)
+_ENERGY_LOSS_ON_FAIL      = float(RISK.energy_loss_on_fail)
+_INJURY_ON_FAIL_PROB      = float(RISK.injury_on_fail_prob)
+_INJURY_DAYS_MIN          = RISK.injury_days_min
+_INJURY_DAYS_MAX          = RISK.injury_days_max
+_INJURY_SPEED_MULT_LO     = float(RISK.injury_speed_mult_lo)
+_INJURY_SPEED_MULT_HI     = float(RISK.injury_speed_mult_hi)
+_FATAL_COUNTERATTACK_PROB = float(RISK.fatal_counterattack_prob)
+
 def _is_in_own_home(creature: Creature) -> bool:
     """True if the creature is within WORLD.home_margin of its home."""
     dx = creature.x - creature.home[0]
     dy = creature.y - creature.home[1]
     return (dx*dx + dy*dy) <= (WORLD.home_margin * WORLD.home_margin)
 
-def _clamp_speed(vx: float, vy: float, vmax: float) -> Tuple[float, float]:
-    spd = math.hypot(vx, vy)
-    if spd <= vmax or spd <= 1e-12:
-        return (vx, vy)
-    f = vmax / spd
-    return (vx * f, vy * f)
-
-def _apply_motion(world: World, me: Creature, vx: float, vy: float, dt: float) -> None:
-    me.x, me.y = world.clamp_inside(me.x + vx * dt, me.y + vy * dt)
-
-def _apply_energy(me: Creature, moving_speed: float, dt: float) -> None:
-    base = ENERGY.C_size * (me.size ** 3) + ENERGY.C_sense * me.sense
-    move = ENERGY.C_move * (me.size ** 3) * (moving_speed ** 2)
-    leak = RISK.injury_energy_leak_per_time if me.injury_days_left > 0 else 0.0
-    mult = me.species.metabolism
-    me.energy -= ((base + move) * mult + leak) * dt
-    if me.energy <= 0:
-        me.alive = False
-
-def _kill_probability(pred: Creature, prey: Creature) -> float:
-    size_ratio = pred.size / max(1e-6, prey.size)
-    speed_adv = pred.speed - prey.speed
-    p = (RISK.base_p_kill
-         + RISK.size_weight * (size_ratio - 1.0)
-         + RISK.speed_weight * (speed_adv / 6.0))
-    return max(RISK.min_p_kill, min(RISK.max_p_kill, p))
-
-
 def _resolve_attack(pred: Creature, prey: Creature) -> None:
     if not pred.alive or not prey.alive:
         return
@@ -60,98 +46,159 @@ def _resolve_attack(pred: Creature, prey: Creature) -> None:
         return
 
     # (keep your success/fail logic as-is below)
-    p_kill = _kill_probability(pred, prey)
+    p_kill = kill_probability(pred, prey)
 
-    if RNG.uniform(0.0, 1.0) <= p_kill:
+    if RNG.random() <= p_kill:
         prey.alive = False
         pred.eaten += 1
         pred.prey_kills_today += 1
         return
 
     # fail: energy loss
-    pred.energy -= RISK.energy_loss_on_fail
+    pred.energy -= _ENERGY_LOSS_ON_FAIL
     if pred.energy <= 0:
         pred.alive = False
         return
 
     # injury on fail
-    if RNG.uniform(0.0, 1.0) <= RISK.injury_on_fail_prob:
-        days = int(RNG.uniform(RISK.injury_days_min, RISK.injury_days_max + 1))
-        mult = RNG.uniform(RISK.injury_speed_mult_lo, RISK.injury_speed_mult_hi)
+    if RNG.random() <= _INJURY_ON_FAIL_PROB:
+        days = int(RNG.uniform(_INJURY_DAYS_MIN, _INJURY_DAYS_MAX + 1))
+        mult = RNG.uniform(_INJURY_SPEED_MULT_LO, _INJURY_SPEED_MULT_HI)
         pred.injury_days_left = max(pred.injury_days_left, days)
         pred.injury_speed_mult = min(pred.injury_speed_mult, mult) if pred.injury_speed_mult < 1.0 else mult
 
     # rare fatal counter if prey significantly larger
     if prey.size >= 1.2 * pred.size:
-        if RNG.uniform(0.0, 1.0) <= RISK.fatal_counterattack_prob:
+        if RNG.random() <= _FATAL_COUNTERATTACK_PROB:
             pred.alive = False
 
-def _consume_food_if_reached(world: World, me: Creature) -> None:
+def _consume_food_if_reached(world: World, me: Creature, r: Optional[float] = None) -> None:
     if not me.alive:
         return
 
     # --- NEW: carnivores never eat plant food ---
-    if me.species.diet.lower() == "carnivore":
+    if me.species.diet_code == CARNIVORE:
         return
 
-    r = bite_radius(me)
-    f = world.nearest_food_within(me.x, me.y, r)
-    if f is not None and math.hypot(f.x - me.x, f.y - me.y) <= r:
+    if r is None:
+        r = bite_radius(me)
+    f = world.nearest_food_within(me.x, me.y, r)   # already within r (squared-distance test)
+    if f is not None:
         me.eaten += 1
         world.remove_food(f.id)
 
-def _consume_prey_if_reached(me: Creature, others: List[Creature]) -> None:
+def _nearest_prey(snap: Snapshot, me: Creature, eat_rules: np.ndarray, r2: float, reach: float) -> int:
+    """
+    numpy twin of kernels.nearest_prey(_in_cells): last-nearest edible living
+    creature within sqrt(r2), or -1. With a grid only the cells within `reach` are tested.
+    """
+    if snap.grid is None:
+        idx = None
+        xs, ys, sizes, alive, ids, diet = snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids, snap.diet
+    else:
+        idx = snap.grid.query(me.x, me.y, reach)   # sorted, so population order is kept
+        xs, ys, sizes = snap.xs[idx], snap.ys[idx], snap.sizes[idx]
+        alive, ids, diet = snap.alive[idx], snap.ids[idx], snap.diet[idx]
+    dx = xs - me.x
+    dy = ys - me.y
+    d2 = dx * dx + dy * dy
+    rule = eat_rules[diet]
+    edible = (((rule == EAT_UP_TO_1_4X) & (sizes <= 1.4 * me.size))
+              | ((rule == EAT_IF_1_2X_LARGER) & (me.size >= 1.2 * sizes)))
+    hit = alive & (ids != me.id) & edible & (d2 <= r2)
+    if not hit.any():
+        return -1
+    j = last_argmin(np.where(hit, d2, np.inf))
+    return j if idx is None else int(idx[j])
+
+def _consume_prey_if_reached(me: Creature, others: List[Creature], snap: Optional[Snapshot] = None,
+                             r: Optional[float] = None) -> None:
+    """
+    Attack the nearest creature `me` may eat within bite range, if any.
+
+    `snap` is World.snapshot(others) taken after this step's motion (positions don't
+    change while interactions resolve), optionally with a grid of largest-bite-reach
+    cells; attack outcomes are written back to snap.alive so later predators of
+    the same step see them. `r` is bite_radius(me) when the caller already has it.
+    """
     if not me.alive:
         return
-    r = bite_radius(me)
-    target: Optional[Creature] = None
-    best_d2 = r * r
-    for o in others:
-        if (not o.alive) or (o.id == me.id):
-            continue
-        if not can_eat(me, o):
+    if not me.species.is_predator_diet:   # can_eat is False for every prey
+        return
+    if snap is None:
+        snap = World.snapshot(others)
+    if r is None:
+        r = bite_radius(me)
+    r2 = r * r                 # exact bite test is d2 <= r2; no sqrt anywhere
+    reach = r * (1.0 + 1e-9)   # grid cells to visit
+    eat_rules = can_eat_row(me)
+    g = snap.grid
+    if kernels.HAVE_NUMBA and g is None:
+        j = kernels.nearest_prey(snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids, snap.diet,
+                                 me.x, me.y, me.id, me.size, eat_rules, r2)
+    elif kernels.HAVE_NUMBA:
+        j = kernels.nearest_prey_in_cells(snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids, snap.diet,
+                                          me.x, me.y, me.id, me.size, eat_rules, r2,
+                                          g.items, g.starts, g.cell, g.x0, g.y0, g.ncols, g.nrows, reach)
+    else:
+        j = _nearest_prey(snap, me, eat_rules, r2, reach)
+    if j >= 0:   # best_d2 started at r2, so the target is within r
+        target = snap.creature(j)
+        _resolve_attack(me, target)
+        snap.alive[j] = target.alive
+        if not me.alive:
+            snap.alive[snap.ids == me.id] = False
+
+def resolve_interactions(world: World, population: List[Creature]) -> None:
+    """Predation first, then food, for every living creature in population order."""
+    # grid cell side = the largest bite reach, from the live config (the UI may edit WORLD)
+    bite_cell = WORLD.bite_radius_scale * TRAITS.max_size
+    snap = world.snapshot(population, bite_cell, BITE_GRID_MIN_POP)
+    for me in population:
+        if not me.alive:
             continue
-        d2 = (o.x - me.x) ** 2 + (o.y - me.y) ** 2
-        if d2 <= best_d2:
-            target = o
-            best_d2 = d2
-    if target is not None:
-        if math.hypot(target.x - me.x, target.y - me.y) <= r:
-            _resolve_attack(me, target)
+        r = bite_radius(me)   # size doesn't change mid-step: one radius for both bites
+        _consume_prey_if_reached(me, population, snap, r)   # predation first
+        _consume_food_if_reached(world, me, r)              # then food
 
 def simulate_day(world: World, population: List[Creature]) -> None:
     world.spawn_food_uniform(int(WORLD.n_food))
     world.spawn_creatures_at_edges(population)
+    # fixed for the day: bound once rather than looked up per creature per step
     dt = WORLD.dt
+    day_steps = int(WORLD.day_steps)
+    c_size, c_sense, c_move = ENERGY.C_size, ENERGY.C_sense, ENERGY.C_move
+    injury_leak = RISK.injury_energy_leak_per_time
+    width, height = world.width, world.height
 
-    for step in range(int(WORLD.day_steps)):
-        steps_left = int(WORLD.day_steps) - step
-        velocities: List[Tuple[int, float, float]] = []
-        for me in population:
-            if not me.alive:
-                velocities.append((me.id, 0.0, 0.0))
-                continue
-            vx, vy = step_behavior(world, me, population, dt, steps_left)
-            vmax = me.effective_speed()
-            vx, vy = _clamp_speed(vx, vy, vmax)
-            velocities.append((me.id, vx, vy))
-
-        id_map = {c.id: c for c in population}
-        for cid, vx, vy in velocities:
-            me = id_map[cid]
+    for step in range(day_steps):
+        velocities = step_tick(world, population, dt, day_steps - step)
+
+        for me, (vx, vy) in zip(population, velocities.tolist()):
             if not me.alive:
                 continue
+            # energy: metabolism scales size/sense upkeep and movement cost
             move_speed = math.hypot(vx, vy)
-            _apply_energy(me, move_speed, dt)
-            if not me.alive:
+            size3 = me.size ** 3
+            base = c_size * size3 + c_sense * me.sense
+            move = c_move * size3 * (move_speed ** 2)
+            leak = injury_leak if me.injury_days_left > 0 else 0.0
+            me.energy -= ((base + move) * me.species.metabolism + leak) * dt
+            if me.energy <= 0:
+                me.alive = False
                 continue
-            _apply_motion(world, me, vx, vy, dt)
+            # motion
+            x = me.x + vx * dt
+            y = me.y + vy * dt
+            # World.clamp_inside, inlined: min(max(v, 0.0), side)
+            if 0.0 > x: x = 0.0
+            if width < x: x = width
+            if 0.0 > y: y = 0.0
+            if height < y: y = height
+            me.x = x
+            me.y = y
 
-        for me in population:
-            if not me.alive:
-                continue
-            _consume_prey_if_reached(me, population)   # predation first
-            _consume_food_if_reached(world, me)        # then food
+        resolve_interactions(world, population)
 
 
 
@@ -195,7 +242,7 @@ def end_of_day_selection(population: List[Creature]) -> Tuple[List[Creature], Li
             c.alive = False
             continue
 
-        diet = c.species.diet.lower()
+        diet = c.species.diet_code
 
         if c.eaten >= 1:
             # must be home to keep gains
@@ -206,11 +253,11 @@ def end_of_day_selection(population: List[Creature]) -> Tuple[List[Creature], Li
             survivors.append(c)
 
             # reproduction rules
-            if diet == "carnivore":
+            if diet == CARNIVORE:
                 if c.prey_kills_today >= 1:
                     repro_orders.append((c, 1))
 
-            elif diet == "omnivore":
+            elif diet == OMNIVORE:
                 if (c.prey_kills_today >= 1) or (c.eaten >= 2):
                     repro_orders.append((c, 1))
 
@@ -221,7 +268,7 @@ def end_of_day_selection(population: List[Creature]) -> Tuple[List[Creature], Li
                     repro_orders.append((c, 1))
                 elif c.eaten == 1:
                     # NEW: small chance to get 1 baby on a 1-food day
-                    if RNG.uniform(0.0, 1.0) < HERB_REPRO_ONEFOOD_CHANCE:
+                    if RNG.random() < HERB_REPRO_ONEFOOD_CHANCE:
                         repro_orders.append((c, 1))
 
         else:
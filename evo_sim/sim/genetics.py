@@ -6,11 +6,15 @@ from .models import Creature, Species
 from .config import REPRO, TRAITS, SPECIATION
 from .rng import RNG
 
+# Frozen config values read per mutated trait, bound once
+_MUTATION_RATE    = float(REPRO.mutation_rate)
+_MUTATION_SD_FRAC = float(REPRO.mutation_sd_frac)
+
 def _mutate_value(val: float, min_v: float, max_v: float) -> float:
-    if RNG.uniform(0.0, 1.0) <= REPRO.mutation_rate:
-        sd = abs(val) * REPRO.mutation_sd_frac
+    if RNG.random() <= _MUTATION_RATE:
+        sd = abs(val) * _MUTATION_SD_FRAC
         if sd <= 1e-6:
-            sd = REPRO.mutation_sd_frac
+            sd = _MUTATION_SD_FRAC
         val = RNG.gauss(val, sd)
     return min(max(val, min_v), max_v)
 
@@ -31,12 +35,13 @@ def _maybe_speciate(parent: Creature, child: Creature, next_species_id: int) ->
             id=next_species_id,
             name=f"Species {next_species_id}",
             color=_random_color(),
-            aggression=RNG.uniform(0.0, 1.0),
-            bravery=RNG.uniform(0.0, 1.0),
+            aggression=RNG.random(),
+            bravery=RNG.random(),
             metabolism=RNG.uniform(SPECIATION.min_metabolism, SPECIATION.max_metabolism),
             diet=RNG.choice(["herbivore", "carnivore", "omnivore"]),
         )
         child.species = new_sp
+        child._sense_radii_cache = None
         return child, next_species_id + 1, True, new_sp
     else:
         child.species = parent.species
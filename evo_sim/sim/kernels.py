@@ -0,0 +1,120 @@
+# evo_sim/sim/kernels.py
+"""
+Optional numba kernels over a World.snapshot: step_behavior's neighbor scans and
+the interaction phase's bite-range prey search.
+
+Each kernel is one sequential pass that mirrors the original Python loops exactly
+(same `<=` tie-breaking, same left-to-right sums, no fastmath), so results are
+bit-identical to the numpy fallbacks (behaviors._scan_neighbors,
+engine._nearest_prey). HAVE_NUMBA is False when numba is not installed; callers
+then keep the numpy path.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from .models import HERBIVORE, EAT_UP_TO_1_4X, EAT_IF_1_2X_LARGER
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def scan_neighbors(xs, ys, sizes, alive, ids, diet, me_x, me_y, me_id, me_size,
+                       threat_size, r_pred2, want_avoid, avoid_r2, want_hunt, eat_rules, prey_r2):
+        """
+        One pass over the neighbors feeding step_behavior's three scans:
+          - index of the nearest living creature with size >= threat_size within sqrt(r_pred2) (-1 if none)
+          - (sum_x, sum_y, count) over living non-herbivores within sqrt(avoid_r2), if want_avoid
+          - indices of creatures the predator may eat (eat_rules: its CAN_EAT row) within sqrt(prey_r2), if want_hunt
+        """
+        n = xs.shape[0]
+        threat = -1
+        best_d2 = r_pred2
+        cx = 0.0
+        cy = 0.0
+        cnt = 0
+        prey = np.empty(n, dtype=np.int64)
+        n_prey = 0
+        for i in range(n):
+            if not alive[i] or ids[i] == me_id:
+                continue
+            dx = xs[i] - me_x
+            dy = ys[i] - me_y
+            d2 = dx * dx + dy * dy
+            if sizes[i] >= threat_size and d2 <= best_d2:
+                threat = i
+                best_d2 = d2
+            if want_avoid and diet[i] != HERBIVORE and d2 <= avoid_r2:
+                cx += xs[i]
+                cy += ys[i]
+                cnt += 1
+            if want_hunt and d2 <= prey_r2:
+                rule = eat_rules[diet[i]]
+                if ((rule == EAT_UP_TO_1_4X and sizes[i] <= 1.4 * me_size)
+                        or (rule == EAT_IF_1_2X_LARGER and me_size >= 1.2 * sizes[i])):
+                    prey[n_prey] = i
+                    n_prey += 1
+        return threat, cx, cy, cnt, prey[:n_prey]
+
+    @njit(cache=True)
+    def nearest_prey(xs, ys, sizes, alive, ids, diet, me_x, me_y, me_id, me_size, eat_rules, r2):
+        """Index of the nearest creature the predator may eat (eat_rules: its CAN_EAT row) within sqrt(r2); -1 if none."""
+        best = -1
+        best_d2 = r2
+        for i in range(xs.shape[0]):
+            if not alive[i] or ids[i] == me_id:
+                continue
+            rule = eat_rules[diet[i]]
+            if not ((rule == EAT_UP_TO_1_4X and sizes[i] <= 1.4 * me_size)
+                    or (rule == EAT_IF_1_2X_LARGER and me_size >= 1.2 * sizes[i])):
+                continue
+            dx = xs[i] - me_x
+            dy = ys[i] - me_y
+            d2 = dx * dx + dy * dy
+            if d2 <= best_d2:
+                best = i
+                best_d2 = d2
+        return best
+
+    @njit(cache=True)
+    def nearest_prey_in_cells(xs, ys, sizes, alive, ids, diet, me_x, me_y, me_id, me_size, eat_rules, r2,
+                              items, starts, cell, x0, y0, ncols, nrows, reach):
+        """
+        nearest_prey over only the UniformGrid cells that [me ± reach] touches.
+        Cells are visited out of population order, so ties on distance go to the
+        higher index explicitly, matching the sequential `<=` scan.
+        """
+        if ncols == 0:
+            return -1
+        c0 = max(int(np.floor((me_x - reach) / cell)) - x0, 0)
+        c1 = min(int(np.floor((me_x + reach) / cell)) - x0, ncols - 1)
+        r0 = max(int(np.floor((me_y - reach) / cell)) - y0, 0)
+        r1 = min(int(np.floor((me_y + reach) / cell)) - y0, nrows - 1)
+        best = -1
+        best_d2 = r2
+        for row in range(r0, r1 + 1):
+            base = row * ncols
+            for k in range(starts[base + c0], starts[base + c1 + 1]):
+                i = items[k]
+                if not alive[i] or ids[i] == me_id:
+                    continue
+                rule = eat_rules[diet[i]]
+                if not ((rule == EAT_UP_TO_1_4X and sizes[i] <= 1.4 * me_size)
+                        or (rule == EAT_IF_1_2X_LARGER and me_size >= 1.2 * sizes[i])):
+                    continue
+                dx = xs[i] - me_x
+                dy = ys[i] - me_y
+                d2 = dx * dx + dy * dy
+                if best < 0:
+                    if d2 <= best_d2:
+                        best = i
+                        best_d2 = d2
+                elif d2 < best_d2 or (d2 == best_d2 and i > best):
+                    best = i
+                    best_d2 = d2
+        return best
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Iterable
 from .models import Species, Creature
 
-@dataclass
+@dataclass(slots=True)
 class SpeciesNode:
     species_id: int
     name: str
@@ -24,8 +24,9 @@ class LineageTracker:
     """
     def __init__(self):
         self.nodes: Dict[int, SpeciesNode] = {}
-        self.children: Dict[int, List[int]] = {}  # species_id -> child ids
+        self.children: Dict[int, List[int]] = {}  # species_id -> child ids, in creation order
         self._order: List[int] = []               # creation order for stable layout
+        self._layout: Optional[Dict[int, int]] = None   # compute_layout_columns cache; None = stale
 
     # ---- registration ----
     def register_root_species(self, species: Species, birth_day: int):
@@ -41,7 +42,7 @@ class LineageTracker:
             current_count=0,
         )
         self.children[species.id] = []
-        self._order.append(species.id)
+        self._append_order(species.id)
 
     def register_speciation(self, parent: Species, child: Species, birth_day: int):
         # ensure parent exists
@@ -60,7 +61,11 @@ class LineageTracker:
             )
             self.children.setdefault(parent.id, []).append(child.id)
             self.children.setdefault(child.id, [])
-            self._order.append(child.id)
+            self._append_order(child.id)
+
+    def _append_order(self, sid: int):
+        self._order.append(sid)
+        self._layout = None
 
     # ---- daily updates ----
     def update_from_population(self, creatures: Iterable[Creature], day: int):
@@ -90,28 +95,20 @@ class LineageTracker:
           - Traverse roots by creation order.
           - DFS over children (in creation order).
           - Assign columns incrementally.
+        The DFS uses an explicit stack, so deep speciation chains can't hit the recursion limit.
+        The layout only changes when a species is registered, so it is cached until then.
         """
-        order = self.get_creation_order()
-        # build adjacency in creation order
-        adj = {sid: list(self.children.get(sid, [])) for sid in self.nodes}
-        for sid in adj:
-            adj[sid].sort(key=lambda cid: order.index(cid) if cid in order else 10**9)
-
-        columns: Dict[int, int] = {}
-        col_counter = 0
-
-        def dfs(sid: int):
-            nonlocal col_counter
-            columns[sid] = col_counter
-            col_counter += 1
-            for child in adj.get(sid, []):
-                dfs(child)
-
-        # do roots in creation order
-        roots = [sid for sid in order if self.nodes[sid].parent_id is None]
-        for r in roots:
-            dfs(r)
-        return columns
+        if self._layout is None:
+            # children lists are appended as species register, so they're already in creation order
+            columns: Dict[int, int] = {}
+            # do roots in creation order; children are pushed reversed so they pop in order
+            stack = [sid for sid in reversed(self._order) if self.nodes[sid].parent_id is None]
+            while stack:
+                sid = stack.pop()
+                columns[sid] = len(columns)
+                stack.extend(reversed(self.children.get(sid, [])))
+            self._layout = columns
+        return dict(self._layout)
 
     # ---- accessors for renderer ----
     def segments(self, current_day: int) -> List[Tuple[int, int, int, int, Tuple[int,int,int]]]:
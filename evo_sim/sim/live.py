@@ -5,9 +5,9 @@ import math
 
 from .models import Creature, Species
 from .world import World
-from .behaviors import step_behavior
-from .config import WORLD, ENERGY
-from .engine import end_of_day_selection, _consume_prey_if_reached, _consume_food_if_reached
+from .behaviors import step_tick
+from .config import WORLD, ENERGY, RISK
+from .engine import end_of_day_selection, resolve_interactions
 from .rng import RNG
 from .genetics import reproduce_N_children
 from .lineage import LineageTracker
@@ -51,55 +51,42 @@ class LiveSim:
         self.world.spawn_creatures_at_edges(self.population)
         self.step_in_day = 0
 
-    def _apply_energy(self, me: Creature, move_speed: float, dt: float):
-        from .config import RISK
-        base = ENERGY.C_size * (me.size ** 3) + ENERGY.C_sense * me.sense
-        move = ENERGY.C_move * (me.size ** 3) * (move_speed ** 2)
-        leak = RISK.injury_energy_leak_per_time if me.injury_days_left > 0 else 0.0
-        mult = me.species.metabolism
-        me.energy -= ((base + move) * mult + leak) * dt
-        if me.energy <= 0:
-            me.alive = False
-
     def _step_once(self):
         dt = WORLD.dt
         pop = self.population
         steps_left = int(WORLD.day_steps) - self.step_in_day
+        c_size, c_sense, c_move = ENERGY.C_size, ENERGY.C_sense, ENERGY.C_move
+        injury_leak = RISK.injury_energy_leak_per_time
+        width, height = self.world.width, self.world.height
 
         # velocities
-        velocities = []
-        for me in pop:
-            if not me.alive:
-                velocities.append((me.id, 0.0, 0.0))
-                continue
-            vx, vy = step_behavior(self.world, me, pop, dt, steps_left)
-            spd = math.hypot(vx, vy)
-            vmax = me.effective_speed()
-            if spd > vmax and spd > 1e-12:
-                s = vmax / spd
-                vx *= s; vy *= s
-            velocities.append((me.id, vx, vy))
+        velocities = step_tick(self.world, pop, dt, steps_left)
 
         # energy + motion
-        id2 = {c.id: c for c in pop}
-        for cid, vx, vy in velocities:
-            me = id2[cid]
+        for me, (vx, vy) in zip(pop, velocities.tolist()):
             if not me.alive:
                 continue
             move_speed = math.hypot(vx, vy)
-            self._apply_energy(me, move_speed, dt)
-            if not me.alive:
+            size3 = me.size ** 3
+            base = c_size * size3 + c_sense * me.sense
+            move = c_move * size3 * (move_speed ** 2)
+            leak = injury_leak if me.injury_days_left > 0 else 0.0
+            me.energy -= ((base + move) * me.species.metabolism + leak) * dt
+            if me.energy <= 0:
+                me.alive = False
                 continue
-            me.x += vx * dt
-            me.y += vy * dt
-            me.x, me.y = self.world.clamp_inside(me.x, me.y)
+            x = me.x + vx * dt
+            y = me.y + vy * dt
+            # World.clamp_inside, inlined: min(max(v, 0.0), side)
+            if 0.0 > x: x = 0.0
+            if width < x: x = width
+            if 0.0 > y: y = 0.0
+            if height < y: y = height
+            me.x = x
+            me.y = y
 
         # interactions
-        for me in pop:
-            if not me.alive:
-                continue
-            _consume_prey_if_reached(me, pop)
-            _consume_food_if_reached(self.world, me)
+        resolve_interactions(self.world, pop)
 
         self.step_in_day += 1
 
@@ -138,6 +125,8 @@ class LiveSim:
         self.last_population_snapshot = list(self.population)
 
         # rebuild next population
+        # (fresh objects, not reset_for_new_day: the snapshot above still holds the
+        # survivors and the UI logs that day's eaten/alive from it after step() returns)
         new_pop: List[Creature] = []
         for s in survivors:
             new_pop.append(Creature(
@@ -172,9 +161,10 @@ class LiveSim:
         n = len(self.population)
         if n == 0:
             return dict(n=0, mean_speed=float('nan'), mean_size=float('nan'), mean_sense=float('nan'))
-        return dict(
-            n=n,
-            mean_speed=sum(c.speed for c in self.population)/n,
-            mean_size=sum(c.size for c in self.population)/n,
-            mean_sense=sum(c.sense for c in self.population)/n,
-        )
\ No newline at end of file
+        # one pass for all three traits
+        s_speed = s_size = s_sense = 0.0
+        for c in self.population:
+            s_speed += c.speed
+            s_size += c.size
+            s_sense += c.sense
+        return dict(n=n, mean_speed=s_speed/n, mean_size=s_size/n, mean_sense=s_sense/n)
\ No newline at end of file
@@ -1,19 +1,32 @@
 # evo_sim/sim/metrics.py
 from __future__ import annotations
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 import csv
 
 from .models import Creature
 
 def summarize_day(day: int, population: List[Creature]) -> Dict[str, float]:
-    alive = sum(1 for c in population if c.alive)
-    ate0 = sum(1 for c in population if c.eaten == 0)
-    ate1 = sum(1 for c in population if c.eaten == 1)
-    ate2p = sum(1 for c in population if c.eaten >= 2)
-    avg_speed = sum(c.speed for c in population) / max(len(population), 1)
-    avg_size = sum(c.size for c in population) / max(len(population), 1)
-    avg_sense = sum(c.sense for c in population) / max(len(population), 1)
+    # one pass over the population; the trait sums stay left-to-right float adds
+    alive = ate0 = ate1 = ate2p = 0
+    s_speed = s_size = s_sense = 0.0
+    for c in population:
+        if c.alive:
+            alive += 1
+        eaten = c.eaten
+        if eaten == 0:
+            ate0 += 1
+        elif eaten == 1:
+            ate1 += 1
+        elif eaten >= 2:
+            ate2p += 1
+        s_speed += c.speed
+        s_size += c.size
+        s_sense += c.sense
+    n = max(len(population), 1)
+    avg_speed = s_speed / n
+    avg_size = s_size / n
+    avg_sense = s_sense / n
     return dict(
         day=day, n=len(population), alive=alive, ate0=ate0, ate1=ate1, ate2p=ate2p,
         avg_speed=avg_speed, avg_size=avg_size, avg_sense=avg_sense
@@ -26,4 +39,35 @@ def append_csv(path: str, row: Dict[str, float]) -> None:
         w = csv.DictWriter(f, fieldnames=list(row.keys()))
         if write_header:
             w.writeheader()
-        w.writerow(row)
\ No newline at end of file
+        w.writerow(row)
+
+class CsvAppender:
+    """
+    append_csv for a whole run: the file stays open, the header is written once
+    (only if the file is new or empty) and rows go through a 64 KiB buffer that
+    is flushed on close. Use as a context manager so an interrupted run still
+    flushes what it logged.
+    """
+    def __init__(self, path: str, buffering: int = 1 << 16):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._f = open(path, "a", newline="", buffering=buffering)
+        self._write_header = self._f.tell() == 0
+        self._w: Optional[csv.DictWriter] = None
+
+    def write(self, row: Dict[str, float]) -> None:
+        if self._w is None:
+            self._w = csv.DictWriter(self._f, fieldnames=list(row.keys()))
+            if self._write_header:
+                self._w.writeheader()
+        self._w.writerow(row)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "CsvAppender":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
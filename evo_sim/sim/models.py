@@ -1,10 +1,25 @@
 # evo_sim/sim/models.py
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
 Vec = Tuple[float, float]
 
-@dataclass
+# Integer diet codes for array-based (per-step snapshot) logic
+HERBIVORE, OMNIVORE, CARNIVORE = 0, 1, 2
+DIET_CODE = {"herbivore": HERBIVORE, "omnivore": OMNIVORE, "carnivore": CARNIVORE}
+
+# Predation rule by diet pair: CAN_EAT[pred diet_code][prey diet_code]. Index 3 is
+# the unknown diet (code -1 lands there): it never hunts but may be hunted.
+EAT_NEVER, EAT_UP_TO_1_4X, EAT_IF_1_2X_LARGER = 0, 1, 2   # prey.size <= 1.4*pred.size | pred.size >= 1.2*prey.size
+CAN_EAT = (
+    # prey: herb            omni                carn       unknown
+    (EAT_NEVER,          EAT_NEVER,          EAT_NEVER, EAT_NEVER),            # herbivore
+    (EAT_IF_1_2X_LARGER, EAT_IF_1_2X_LARGER, EAT_NEVER, EAT_IF_1_2X_LARGER),   # omnivore
+    (EAT_UP_TO_1_4X,     EAT_UP_TO_1_4X,     EAT_NEVER, EAT_UP_TO_1_4X),       # carnivore
+    (EAT_NEVER,          EAT_NEVER,          EAT_NEVER, EAT_NEVER),            # unknown
+)
+
+@dataclass(slots=True)
 class Species:
     id: int
     name: str
@@ -14,13 +29,31 @@ class Species:
     metabolism: float
     diet: str  # "herbivore" | "carnivore" | "omnivore"
 
-@dataclass
+    # Derived from `diet` once at construction; the hot paths compare these, not strings
+    diet_key: str = field(init=False, repr=False, compare=False)   # diet.lower(): DIET_CODE / UI color key
+    diet_code: int = field(init=False, repr=False, compare=False)
+    is_prey_diet: bool = field(init=False, repr=False, compare=False)       # others may eat it
+    is_predator_diet: bool = field(init=False, repr=False, compare=False)   # it hunts
+
+    # Sense-radius modifiers: aggression widens prey pursuit, low bravery widens predator watch
+    prey_radius_mult: float = field(init=False, repr=False, compare=False)
+    pred_radius_mult: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.diet_key = self.diet.lower()
+        self.diet_code = DIET_CODE.get(self.diet_key, -1)
+        self.is_prey_diet = self.diet_code in (HERBIVORE, OMNIVORE)
+        self.is_predator_diet = self.diet_code in (OMNIVORE, CARNIVORE)
+        self.prey_radius_mult = 1.0 + 0.5 * max(0.0, min(1.0, self.aggression))
+        self.pred_radius_mult = 1.0 + 0.5 * max(0.0, min(1.0, (1.0 - self.bravery)))
+
+@dataclass(slots=True)
 class Food:
     x: float
     y: float
     id: int
 
-@dataclass
+@dataclass(slots=True)
 class Creature:
     id: int
     species: Species
@@ -44,12 +77,35 @@ class Creature:
     injury_days_left: int = 0
     injury_speed_mult: float = .8  # <1.0 while injured
 
+    # (r_food, r_pred, r_prey) from behaviors._sense_radii; sense and species are
+    # fixed for a creature's life, so reset only where they're reassigned
+    _sense_radii_cache: Optional[Tuple[float, float, float]] = field(default=None, init=False, repr=False, compare=False)
+
     def pos(self) -> Vec:
         return (self.x, self.y)
 
     def at_home(self, margin: float) -> bool:
-        hx, hy = self.home
-        return ((self.x - hx) ** 2 + (self.y - hy) ** 2) ** 0.5 <= margin
+        dx = self.x - self.home[0]
+        dy = self.y - self.home[1]
+        return dx*dx + dy*dy <= margin * margin   # squared: no sqrt for a yes/no test
+
+    def reset_for_new_day(self) -> None:
+        """
+        Put a survivor back in the state a freshly built Creature has (same as
+        Creature(id, species, speed, size, sense, 0, 0, (0, 0), 0, hungry_streak=...)),
+        without allocating one. Identity, traits, species and hungry_streak carry over.
+        """
+        self.x = self.y = 0.0
+        self.home = (0.0, 0.0)
+        self.energy = 0.0
+        self.eaten = 0
+        self.alive = True
+        self.going_home = False
+        self.heading = 0.0
+        self.target = None
+        self.prey_kills_today = 0
+        self.injury_days_left = 0
+        self.injury_speed_mult = .8
 
     def effective_speed(self) -> float:
         return self.speed * (self.injury_speed_mult if self.injury_days_left > 0 else 1.0)
\ No newline at end of file
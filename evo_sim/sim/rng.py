@@ -8,6 +8,11 @@ class RNG:
     def seed(cls, s: int):
         cls._rng.seed(s)
 
+    @classmethod
+    def random(cls) -> float:
+        """Same draw as uniform(0.0, 1.0) (0.0 + 1.0*x is exact), minus the scaling."""
+        return cls._rng.random()
+
     @classmethod
     def uniform(cls, a: float, b: float) -> float:
         return cls._rng.uniform(a, b)
@@ -0,0 +1,56 @@
+# evo_sim/sim/spatial.py
+from __future__ import annotations
+import math
+
+import numpy as np
+
+# Uniform grid used by World.snapshot for neighbor queries
+GRID_CELL_SIZE = 10.0   # world units per cell side
+GRID_MIN_POP = 4000     # below this, masking every creature's arrays beats bucketing (measured)
+# Grid for the interaction phase's bite-range prey search (engine.resolve_interactions)
+BITE_GRID_MIN_POP = 600   # below this, one full scan per predator beats building the grid (measured)
+# World's food buckets: a bite (<= 2.1) touches at most 2x2 cells, a forage radius (~10-17) about 7x7
+FOOD_CELL_SIZE = 5.0
+
+
+class UniformGrid:
+    """
+    Points bucketed into square cells, stored CSR-style: `items` holds point
+    indices sorted by cell and `starts[k]:starts[k+1]` is cell k's run. A radius
+    query returns every point in the cells overlapping the query's bounding box
+    (a superset of the disc; callers still test the exact distance).
+    """
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, cell_size: float = GRID_CELL_SIZE,
+                 mask: np.ndarray | None = None):
+        self.cell = float(cell_size)
+        idx = np.flatnonzero(mask) if mask is not None else np.arange(len(xs))
+        cx = np.floor(xs[idx] / self.cell).astype(np.int64)
+        cy = np.floor(ys[idx] / self.cell).astype(np.int64)
+        if len(idx) == 0:
+            self.x0 = self.y0 = 0
+            self.ncols = self.nrows = 0
+            self.items = idx
+            self.starts = np.zeros(1, dtype=np.int64)
+            return
+        self.x0, self.y0 = int(cx.min()), int(cy.min())
+        self.ncols = int(cx.max()) - self.x0 + 1
+        self.nrows = int(cy.max()) - self.y0 + 1
+        keys = (cy - self.y0) * self.ncols + (cx - self.x0)
+        order = np.argsort(keys, kind="stable")
+        self.items = idx[order]
+        self.starts = np.searchsorted(keys[order], np.arange(self.ncols * self.nrows + 1))
+
+    def query(self, x: float, y: float, radius: float) -> np.ndarray:
+        """Sorted indices of the points in every cell that [x±radius] x [y±radius] touches."""
+        c0 = max(math.floor((x - radius) / self.cell) - self.x0, 0)
+        c1 = min(math.floor((x + radius) / self.cell) - self.x0, self.ncols - 1)
+        r0 = max(math.floor((y - radius) / self.cell) - self.y0, 0)
+        r1 = min(math.floor((y + radius) / self.cell) - self.y0, self.nrows - 1)
+        if c0 > c1 or r0 > r1:
+            return self.items[:0]
+        # cells c0..c1 of one row are contiguous in `items`: one slice per row
+        starts = self.starts
+        out = np.concatenate([self.items[starts[row + c0]:starts[row + c1 + 1]]
+                              for row in range(r0 * self.ncols, (r1 + 1) * self.ncols, self.ncols)])
+        out.sort()
+        return out
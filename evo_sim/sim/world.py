@@ -1,18 +1,64 @@
 # evo_sim/sim/world.py
 from __future__ import annotations
-from typing import List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 import math
 
+import numpy as np
+
 from .models import Food, Creature
+from .spatial import UniformGrid, GRID_CELL_SIZE, GRID_MIN_POP, FOOD_CELL_SIZE
 from .rng import RNG
 from .config import WORLD, ENERGY, PRED_HOME
 
 
+@dataclass
+class Snapshot:
+    """
+    Structure-of-arrays view of the population at the start of a step.
+    Index i in every array is creature(i); positions don't change until all
+    velocities of the step are decided, so one snapshot serves the whole pass.
+    Positions and sizes stay float64: the scans must match the scalar float64
+    math on Creature exactly, which float32 copies would not.
+    """
+    creatures: List[Creature]   # the whole population
+    xs: np.ndarray       # float64
+    ys: np.ndarray       # float64
+    sizes: np.ndarray    # float64
+    alive: np.ndarray    # bool
+    ids: np.ndarray      # int64
+    diet: np.ndarray     # int8, Species.diet_code
+    grid: Optional[UniformGrid] = None   # living creatures bucketed by cell (large populations only)
+    index: Optional[np.ndarray] = None   # population positions of the rows, for a subset from around()
+
+    def creature(self, i: int) -> Creature:
+        return self.creatures[i if self.index is None else self.index[i]]
+
+    def around(self, x: float, y: float, radius: float) -> "Snapshot":
+        """The creatures in grid cells within `radius` of (x, y), in population order (self if no grid)."""
+        if self.grid is None:
+            return self
+        idx = self.grid.query(x, y, radius)
+        return Snapshot(
+            creatures=self.creatures,
+            xs=self.xs[idx], ys=self.ys[idx], sizes=self.sizes[idx],
+            alive=self.alive[idx], ids=self.ids[idx], diet=self.diet[idx], index=idx,
+        )
+
+
+def _food_cell(x: float, y: float) -> Tuple[int, int]:
+    return (math.floor(x / FOOD_CELL_SIZE), math.floor(y / FOOD_CELL_SIZE))
+
+
 class World:
     def __init__(self, width: float = WORLD.width, height: float = WORLD.height):
         self.width = width
         self.height = height
-        self.food: List[Food] = []
+        self.food: List[Food] = []   # unordered: remove_food swaps the last item into the hole
+        # food id -> position in self.food, and the same Food objects bucketed by
+        # FOOD_CELL_SIZE cell; both kept in step by spawn/remove
+        self._food_index: Dict[int, int] = {}
+        self._food_cells: Dict[Tuple[int, int], List[Food]] = {}
         self._food_id = 0
 
     def _next_food_id(self) -> int:
@@ -21,10 +67,15 @@ class World:
 
     def spawn_food_uniform(self, n: int) -> None:
         self.food = []
+        self._food_index = {}
+        self._food_cells = {}
         for _ in range(n):
             x = RNG.uniform(0.0, self.width)
             y = RNG.uniform(0.0, self.height)
-            self.food.append(Food(x=x, y=y, id=self._next_food_id()))
+            f = Food(x=x, y=y, id=self._next_food_id())
+            self._food_index[f.id] = len(self.food)
+            self.food.append(f)
+            self._food_cells.setdefault(_food_cell(x, y), []).append(f)
 
     # --- helpers for placement ---
     def _random_edge_point(self) -> Tuple[float, float]:
@@ -62,9 +113,7 @@ class World:
           - Predators (carnivores & omnivores) spawn at/near the world center; home = center location.
         """
         for c in population:
-            diet = c.species.diet.lower()
-
-            # if diet == "herbivore":
+            # if c.species.diet_code == HERBIVORE:
             #     # Original behavior: edges
             #     x, y = self._random_edge_point()
             #     c.x, c.y = x, y
@@ -98,19 +147,61 @@ class World:
                     c.injury_speed_mult = 1.0
 
 
+    # --- per-step population arrays ---
+    @staticmethod
+    def snapshot(population: List[Creature], cell_size: float = GRID_CELL_SIZE,
+                 grid_min_pop: int = GRID_MIN_POP) -> Snapshot:
+        """Arrays of the population now; bucketed into a `cell_size` grid once n >= grid_min_pop."""
+        n = len(population)
+        snap = Snapshot(
+            creatures=population,
+            xs=np.fromiter((c.x for c in population), np.float64, n),
+            ys=np.fromiter((c.y for c in population), np.float64, n),
+            sizes=np.fromiter((c.size for c in population), np.float64, n),
+            alive=np.fromiter((c.alive for c in population), np.bool_, n),
+            ids=np.fromiter((c.id for c in population), np.int64, n),
+            diet=np.fromiter((c.species.diet_code for c in population), np.int8, n),
+        )
+        if n >= grid_min_pop:
+            snap.grid = UniformGrid(snap.xs, snap.ys, cell_size, mask=snap.alive)
+        return snap
+
     # --- spatial helpers ---
     def nearest_food_within(self, x: float, y: float, radius: float) -> Optional[Food]:
+        """
+        Nearest food with (f.x-x)**2 + (f.y-y)**2 <= radius**2, the higher id on a
+        tie. Only the food cells the radius touches are tested, unless that is
+        more cells than there is food.
+        """
         best = None
         best_d2 = radius * radius
-        for f in self.food:
-            d2 = (f.x - x)**2 + (f.y - y)**2
-            if d2 <= best_d2:
-                best = f
-                best_d2 = d2
+        reach = radius * (1.0 + 1e-9)
+        cx0, cy0 = _food_cell(x - reach, y - reach)
+        cx1, cy1 = _food_cell(x + reach, y + reach)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) >= len(self.food):
+            cells = (self.food,)
+        else:
+            cells = [self._food_cells.get((cx, cy), ())
+                     for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+        # self.food is unordered and cells are visited out of id order: ties go to the higher id explicitly
+        for cell in cells:
+            for f in cell:
+                d2 = (f.x - x)**2 + (f.y - y)**2
+                if d2 < best_d2 or (d2 == best_d2 and (best is None or f.id > best.id)):
+                    best = f
+                    best_d2 = d2
         return best
 
     def remove_food(self, fid: int) -> None:
-        self.food = [f for f in self.food if f.id != fid]
+        i = self._food_index.pop(fid, None)
+        if i is None:
+            return
+        f = self.food[i]
+        last = self.food.pop()
+        if last is not f:   # O(1): move the last food into the hole
+            self.food[i] = last
+            self._food_index[last.id] = i
+        self._food_cells[_food_cell(f.x, f.y)].remove(f)
 
     @staticmethod
     def dist(a: Tuple[float, float], b: Tuple[float, float]) -> float:
@@ -0,0 +1,59 @@
+"""Creature.at_home's squared-distance test at the margin, and the copies of it in engine and the recorder."""
+import math
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from evo_sim.sim import engine
+from evo_sim.sim.config import WORLD
+from evo_sim.sim.models import Creature, Species
+from evo_sim.ui.recorder import Recorder
+
+SP = Species(1, "S", (0, 0, 0), 0.5, 0.5, 1.0, "herbivore")
+
+
+def _at(x, y, home=(10.0, 10.0), eaten=1):
+    c = Creature(1, SP, 1.0, 1.0, 10.0, x, y, home, 50.0)
+    c.eaten = eaten
+    return c
+
+
+@pytest.mark.parametrize("margin", [1.5, 2.0])
+def test_boundary_is_home(margin):
+    # margin and the offsets are exact in binary, so d2 == margin*margin exactly
+    assert _at(10.0, 10.0).at_home(margin)
+    assert _at(10.0 + margin, 10.0).at_home(margin)
+    assert _at(10.0, 10.0 - margin).at_home(margin)
+    assert not _at(math.nextafter(10.0 + margin, math.inf), 10.0).at_home(margin)
+    assert not _at(10.0 + margin, 10.0 + 0.5).at_home(margin)
+    # 3-4-5 triangle scaled to the margin: a diagonal point exactly on the circle
+    assert _at(10.0 + 0.6 * 5.0, 10.0 + 0.8 * 5.0).at_home(5.0)
+
+
+def _ring(m, home=(10.0, 10.0)):
+    """Points on, just inside and just outside the margin along axes and diagonals."""
+    pts = []
+    for ux, uy in [(1, 0), (0, 1), (-1, 0), (0, -1), (0.6, 0.8), (-0.8, 0.6), (math.sqrt(0.5), math.sqrt(0.5))]:
+        x, y = home[0] + ux * m, home[1] + uy * m
+        for sx in (-math.inf, None, math.inf):
+            for sy in (-math.inf, None, math.inf):
+                pts.append((x if sx is None else math.nextafter(x, sx),
+                            y if sy is None else math.nextafter(y, sy)))
+    return pts
+
+
+def test_engine_and_recorder_agree_with_at_home():
+    m = WORLD.home_margin
+    pop = [_at(x, y) for x, y in _ring(m)]
+    want = [c.at_home(m) for c in pop]
+    assert any(want) and not all(want)   # the ring straddles the margin
+    assert [engine._is_in_own_home(c) for c in pop] == want
+
+    pop[0].eaten = 0          # not done: hasn't eaten
+    pop[1].alive = False      # not done: dead
+    rec = Recorder(enabled=True, stride_steps=1)
+    live = SimpleNamespace(population=pop, food_positions=lambda: [], day=1, step_in_day=0)
+    rec.maybe_capture(live)
+    done = [c.alive and c.eaten >= 1 and c.at_home(m) for c in pop]
+    np.testing.assert_array_equal(rec.done[0, :len(pop)], done)
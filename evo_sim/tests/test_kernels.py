@@ -0,0 +1,176 @@
+"""
+The numba kernels, the numpy fallbacks and the UniformGrid paths must pick the
+same creatures bit for bit. Populations sit on a half-unit lattice with integer
+radii, so equal distances and d2 == r*r (the range edge) occur all the time.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from evo_sim.sim import behaviors, engine, kernels
+from evo_sim.sim.models import Creature, Species
+from evo_sim.sim.rng import RNG
+from evo_sim.sim.spatial import GRID_CELL_SIZE, GRID_MIN_POP, BITE_GRID_MIN_POP
+from evo_sim.sim.world import World
+
+needs_numba = pytest.mark.skipif(not kernels.HAVE_NUMBA, reason="numba not installed")
+
+RADII = (1.0, 2.0, 3.0, 5.0)   # r*r is exact, and lattice points land exactly on it
+
+
+def _species():
+    diets = ["herbivore", "omnivore", "carnivore", "herbivore", "unknown"]
+    return [Species(i + 1, f"S{i}", (100, 100, 100), aggression=0.3 * i % 1.0, bravery=0.5,
+                    metabolism=1.0, diet=d) for i, d in enumerate(diets)]
+
+
+def _population(n, seed, side=40.0):
+    """Seeded creatures on a 0.5 lattice, a few sizes (1.2 * 1.0 == 1.2 exactly), some dead."""
+    rnd = random.Random(seed)
+    sps = _species()
+    pop = []
+    for i in range(n):
+        c = Creature(id=i + 1, species=rnd.choice(sps), speed=rnd.choice((1.0, 1.5, 2.0)),
+                     size=rnd.choice((0.8, 1.0, 1.2, 1.5, 2.0)), sense=rnd.choice((6.0, 10.0, 14.0)),
+                     x=rnd.randrange(int(2 * side) + 1) * 0.5, y=rnd.randrange(int(2 * side) + 1) * 0.5,
+                     home=(side / 2, side / 2), energy=100.0)
+        c.alive = rnd.random() > 0.1
+        pop.append(c)
+    return pop
+
+
+def _grid_snapshot(pop, cell):
+    return World.snapshot(pop, cell, 0)   # grid forced on
+
+
+def _nogrid_snapshot(pop):
+    return World.snapshot(pop, GRID_CELL_SIZE, len(pop) + 1)   # grid forced off
+
+
+# ---------------- step_behavior's neighbor scan ----------------
+@needs_numba
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_scan_neighbors_kernel_matches_numpy(seed):
+    pop = _population(150, seed)
+    snap = _nogrid_snapshot(pop)
+    for me in pop[:60]:
+        rules = behaviors.can_eat_row(me)
+        for r_pred in RADII:
+            for r_prey in RADII:
+                for want_avoid in (False, True):
+                    for want_hunt in (False, True):
+                        args = (1.2 * me.size, r_pred * r_pred, want_avoid, (1.5 * r_pred) ** 2,
+                                want_hunt)
+                        k = kernels.scan_neighbors(snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids,
+                                                   snap.diet, me.x, me.y, me.id, me.size,
+                                                   *args, rules, r_prey * r_prey)
+                        p = behaviors._scan_neighbors(snap, me, me.x, me.y, *args, r_prey * r_prey)
+                        assert k[0] == p[0]
+                        assert k[1] == p[1] and k[2] == p[2] and k[3] == p[3]   # exact sums
+                        np.testing.assert_array_equal(k[4], p[4])
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_scan_neighbors_same_with_and_without_grid(seed):
+    pop = _population(300, seed)
+    plain = _nogrid_snapshot(pop)
+    gridded = _grid_snapshot(pop, GRID_CELL_SIZE)
+    for me in pop[:80]:
+        for r in RADII + (12.0,):
+            reach = 1.5 * r * (1.0 + 1e-9)
+            args = (1.2 * me.size, r * r, True, (1.5 * r) ** 2, True, r * r)
+            a = behaviors._scan_neighbors(plain.around(me.x, me.y, reach), me, me.x, me.y, *args)
+            sub = gridded.around(me.x, me.y, reach)
+            b = behaviors._scan_neighbors(sub, me, me.x, me.y, *args)
+            # indices are into different row sets: compare the creatures they name
+            assert (a[0] < 0) == (b[0] < 0)
+            if a[0] >= 0:
+                assert plain.creature(a[0]) is sub.creature(b[0])
+            assert a[1:4] == b[1:4]
+            assert [plain.creature(i) for i in a[4]] == [sub.creature(i) for i in b[4]]
+
+
+# ---------------- the interaction phase's prey search ----------------
+def _prey_queries(pop):
+    for me in pop:
+        if me.alive and me.species.is_predator_diet:
+            for r in RADII:
+                yield me, behaviors.can_eat_row(me), r
+
+
+@needs_numba
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_nearest_prey_kernel_matches_numpy(seed):
+    pop = _population(200, seed)
+    snap = _nogrid_snapshot(pop)
+    for me, rules, r in _prey_queries(pop):
+        k = kernels.nearest_prey(snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids, snap.diet,
+                                 me.x, me.y, me.id, me.size, rules, r * r)
+        assert k == engine._nearest_prey(snap, me, rules, r * r, r * (1.0 + 1e-9))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("cell", [1.0, 2.1, 5.0])
+def test_nearest_prey_same_with_and_without_grid(seed, cell):
+    pop = _population(300, seed)
+    plain = _nogrid_snapshot(pop)
+    gridded = _grid_snapshot(pop, cell)
+    for me, rules, r in _prey_queries(pop):
+        reach = r * (1.0 + 1e-9)
+        want = engine._nearest_prey(plain, me, rules, r * r, reach)
+        assert engine._nearest_prey(gridded, me, rules, r * r, reach) == want
+        if kernels.HAVE_NUMBA:
+            g = gridded.grid
+            got = kernels.nearest_prey_in_cells(gridded.xs, gridded.ys, gridded.sizes, gridded.alive,
+                                                gridded.ids, gridded.diet, me.x, me.y, me.id, me.size,
+                                                rules, r * r, g.items, g.starts, g.cell, g.x0, g.y0,
+                                                g.ncols, g.nrows, reach)
+            assert got == want
+
+
+def test_nearest_prey_range_edge_and_ties():
+    """d2 == r*r is in range; of equally near prey the later one in population order wins."""
+    sp_c, sp_h = Species(1, "C", (0, 0, 0), 0.5, 0.5, 1.0, "carnivore"), Species(2, "H", (0, 0, 0), 0.5, 0.5, 1.0, "herbivore")
+    me = Creature(1, sp_c, 1.0, 1.0, 10.0, 10.0, 10.0, (0.0, 0.0), 50.0)
+    on_edge = [Creature(i, sp_h, 1.0, 1.0, 10.0, x, y, (0.0, 0.0), 50.0)
+               for i, (x, y) in enumerate([(13.0, 10.0), (10.0, 7.0), (7.0, 10.0), (10.0, 13.0)], start=2)]
+    beyond = Creature(9, sp_h, 1.0, 1.0, 10.0, 13.0, 10.5, (0.0, 0.0), 50.0)
+    pop = [me, *on_edge, beyond]
+    rules = behaviors.can_eat_row(me)
+    for snap in (_nogrid_snapshot(pop), _grid_snapshot(pop, 2.0)):
+        assert engine._nearest_prey(snap, me, rules, 9.0, 3.0 * (1.0 + 1e-9)) == 4   # last of the ties
+        assert engine._nearest_prey(snap, me, rules, 8.999, 3.0) == -1
+        if kernels.HAVE_NUMBA:
+            assert kernels.nearest_prey(snap.xs, snap.ys, snap.sizes, snap.alive, snap.ids, snap.diet,
+                                        me.x, me.y, me.id, me.size, rules, 9.0) == 4
+
+
+# ---------------- whole steps, grid thresholds below and above the population ----------------
+def _run_steps(monkeypatch, grid_min_pop, bite_grid_min_pop, n=250, steps=6):
+    monkeypatch.setattr(World.snapshot, "__defaults__", (GRID_CELL_SIZE, grid_min_pop))
+    monkeypatch.setattr(engine, "BITE_GRID_MIN_POP", bite_grid_min_pop)
+    RNG.seed(7)
+    pop = _population(n, seed=3)
+    for c in pop:
+        c.alive = True
+    world = World(40.0, 40.0)
+    world.spawn_food_uniform(200)
+    trace = []
+    for step in range(steps):
+        vel = behaviors.step_tick(world, pop, 0.05, steps - step)
+        for c, (vx, vy) in zip(pop, vel.tolist()):
+            if c.alive:
+                c.x, c.y = world.clamp_inside(c.x + vx * 0.05, c.y + vy * 0.05)
+        engine.resolve_interactions(world, pop)
+        trace.append((vel.tobytes(), [(c.x, c.y, c.alive, c.eaten, c.energy) for c in pop],
+                      sorted(f.id for f in world.food)))
+    return trace
+
+
+@pytest.mark.parametrize("grid_on", [(0, 0), (0, 10**9), (10**9, 0)])
+def test_steps_same_with_and_without_grids(monkeypatch, grid_on):
+    assert GRID_MIN_POP > 250 and BITE_GRID_MIN_POP > 250   # the defaults leave both grids off here
+    with monkeypatch.context() as m:
+        want = _run_steps(m, 10**9, 10**9)
+    assert _run_steps(monkeypatch, *grid_on) == want
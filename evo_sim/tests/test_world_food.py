@@ -0,0 +1,95 @@
+"""World's food bookkeeping: remove_food's swap-pop and nearest_food_within's cell search."""
+import random
+
+import pytest
+
+from evo_sim.sim.rng import RNG
+from evo_sim.sim.world import World, _food_cell
+
+
+def _lattice_world(monkeypatch, n, seed, side=30.0):
+    """Food on a 0.5 lattice (many equal distances, items on cell borders)."""
+    rnd = random.Random(seed)
+    monkeypatch.setattr(RNG, "uniform", classmethod(lambda cls, a, b: round(rnd.uniform(a, b) * 2.0) / 2.0))
+    w = World(side, side)
+    w.spawn_food_uniform(n)
+    return w
+
+
+def _check_index(w):
+    assert len(w._food_index) == len(w.food)
+    for i, f in enumerate(w.food):
+        assert w._food_index[f.id] == i
+    in_cells = [f for cell in w._food_cells.values() for f in cell]
+    assert sorted(f.id for f in in_cells) == sorted(f.id for f in w.food)
+    for key, cell in w._food_cells.items():
+        assert all(_food_cell(f.x, f.y) == key for f in cell)
+
+
+def _brute_nearest(w, x, y, r):
+    hits = [((f.x - x)**2 + (f.y - y)**2, -f.id, f) for f in w.food]
+    hits = [h for h in hits if h[0] <= r * r]
+    return min(hits)[2] if hits else None   # nearest, then the higher id
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_remove_food_keeps_list_index_and_cells_in_step(monkeypatch, seed):
+    w = _lattice_world(monkeypatch, 120, seed)
+    order = [f.id for f in w.food]
+    random.Random(seed).shuffle(order)   # removals from the middle move the last item into the hole
+    for k, fid in enumerate(order):
+        w.remove_food(fid)
+        assert fid not in w._food_index
+        if k % 7 == 0:
+            _check_index(w)
+    assert w.food == [] and w._food_index == {}
+    assert all(cell == [] for cell in w._food_cells.values())
+
+
+def test_remove_unknown_or_eaten_food_is_a_noop(monkeypatch):
+    w = _lattice_world(monkeypatch, 20, 3)
+    fid = w.food[5].id
+    w.remove_food(fid)
+    before = list(w.food)
+    w.remove_food(fid)
+    w.remove_food(10**6)
+    assert w.food == before
+    _check_index(w)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_nearest_food_within_matches_brute_force(monkeypatch, seed):
+    w = _lattice_world(monkeypatch, 150, seed)
+    rnd = random.Random(100 + seed)
+    ids = [f.id for f in w.food]
+    rnd.shuffle(ids)
+    for fid in ids[:60]:   # some holes, and self.food no longer in id order
+        w.remove_food(fid)
+    # small radii search a few cells, the large ones fall back to the linear scan
+    for r in (0.5, 1.0, 2.5, 5.0, 40.0):
+        for _ in range(150):
+            x, y = rnd.randrange(61) * 0.5, rnd.randrange(61) * 0.5
+            assert w.nearest_food_within(x, y, r) is _brute_nearest(w, x, y, r)
+
+
+def _world_with_food(monkeypatch, points):
+    coords = iter([c for pt in points for c in pt])
+    monkeypatch.setattr(RNG, "uniform", classmethod(lambda cls, a, b: next(coords)))
+    w = World(30.0, 30.0)
+    w.spawn_food_uniform(len(points))
+    return w
+
+
+# ids 1..4 exactly 2.0 from (10, 10); id 4 sits in the first cell the search visits
+RING = [(12.0, 10.0), (10.0, 12.0), (10.0, 8.0), (8.0, 10.0)]
+
+
+# radius 2 around (10, 10) touches 4 cells: linear scan with 4 food, cell search with more
+@pytest.mark.parametrize("extra", [[], [(12.0, 10.5)] + [(28.0, 28.0)] * 40], ids=["linear", "cells"])
+def test_nearest_food_within_range_edge_and_higher_id_tie(monkeypatch, extra):
+    w = _world_with_food(monkeypatch, RING + extra)
+    assert w.nearest_food_within(10.0, 10.0, 2.0).id == 4   # d2 == r*r is in range
+    assert w.nearest_food_within(10.0, 10.0, 1.999) is None
+    w.remove_food(4)
+    w.remove_food(2)
+    assert w.nearest_food_within(10.0, 10.0, 2.0).id == 3
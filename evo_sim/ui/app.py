@@ -73,72 +73,75 @@ def run_ui():
     sim_speed = 10  # steps/frame
     running = True
 
-    while running:
-        clock.tick(60)
+    try:
+        while running:
+            clock.tick(60)
 
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                running = False
-            elif e.type == pygame.VIDEORESIZE:
-                screen = pygame.display.set_mode(e.size, pygame.RESIZABLE | pygame.SCALED)
-                world_rect, panel_rect = layout()
-                renderer = Renderer(screen, world_rect, panel_rect)
-                renderer.panel_mode = "traits"
-            elif e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_ESCAPE: running = False
-                elif e.key == pygame.K_SPACE: paused = not paused
-                elif e.key == pygame.K_r:
-                    lineage = LineageTracker()
-                    init_pop = _init_population(SIM.initial_population)
-                    for c in init_pop:
-                        lineage.register_root_species(c.species, birth_day=1)
-                    live = LiveSim(init_pop, seed=random.randint(0, 1_000_000), lineage=lineage)
-                    paused = False
-                elif e.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
-                    WORLD.n_food = min(1000, int(WORLD.n_food) + 5)
-                elif e.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
-                    WORLD.n_food = max(0, int(WORLD.n_food) - 5)
-                elif e.key == pygame.K_LEFTBRACKET:
-                    sim_speed = max(1, sim_speed - 1)
-                elif e.key == pygame.K_RIGHTBRACKET:
-                    sim_speed = min(50, sim_speed + 1)
-                elif e.key == pygame.K_1: live.mutate_speed = not live.mutate_speed
-                elif e.key == pygame.K_2: live.mutate_size  = not live.mutate_size
-                elif e.key == pygame.K_3: live.mutate_sense = not live.mutate_sense
-                elif e.key == pygame.K_m:
-                    on = not (live.mutate_speed and live.mutate_size and live.mutate_sense)
-                    live.mutate_speed = live.mutate_size = live.mutate_sense = on
-                elif e.key == pygame.K_v: recorder.toggle()
-                elif e.key == pygame.K_c: recorder.clear()
-                elif e.key == pygame.K_s: recorder.save_npz()
-                elif e.key == pygame.K_l:  # 'L' toggles species CSV
-                    logger.enable_species = not logger.enable_species
-                elif e.key == pygame.K_t:
-                    renderer.panel_mode = "phylo" if renderer.panel_mode == "traits" else "traits"
-                    # --- inside the main event loop ---
-                elif e.key == pygame.K_g:
-                    renderer.glyph_mode = "quads" if renderer.glyph_mode == "rings" else "rings"
+            for e in pygame.event.get():
+                if e.type == pygame.QUIT:
+                    running = False
+                elif e.type == pygame.VIDEORESIZE:
+                    screen = pygame.display.set_mode(e.size, pygame.RESIZABLE | pygame.SCALED)
+                    world_rect, panel_rect = layout()
+                    renderer = Renderer(screen, world_rect, panel_rect)
+                    renderer.panel_mode = "traits"
+                elif e.type == pygame.KEYDOWN:
+                    if e.key == pygame.K_ESCAPE: running = False
+                    elif e.key == pygame.K_SPACE: paused = not paused
+                    elif e.key == pygame.K_r:
+                        lineage = LineageTracker()
+                        init_pop = _init_population(SIM.initial_population)
+                        for c in init_pop:
+                            lineage.register_root_species(c.species, birth_day=1)
+                        live = LiveSim(init_pop, seed=random.randint(0, 1_000_000), lineage=lineage)
+                        paused = False
+                    elif e.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                        WORLD.n_food = min(1000, int(WORLD.n_food) + 5)
+                    elif e.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                        WORLD.n_food = max(0, int(WORLD.n_food) - 5)
+                    elif e.key == pygame.K_LEFTBRACKET:
+                        sim_speed = max(1, sim_speed - 1)
+                    elif e.key == pygame.K_RIGHTBRACKET:
+                        sim_speed = min(50, sim_speed + 1)
+                    elif e.key == pygame.K_1: live.mutate_speed = not live.mutate_speed
+                    elif e.key == pygame.K_2: live.mutate_size  = not live.mutate_size
+                    elif e.key == pygame.K_3: live.mutate_sense = not live.mutate_sense
+                    elif e.key == pygame.K_m:
+                        on = not (live.mutate_speed and live.mutate_size and live.mutate_sense)
+                        live.mutate_speed = live.mutate_size = live.mutate_sense = on
+                    elif e.key == pygame.K_v: recorder.toggle()
+                    elif e.key == pygame.K_c: recorder.clear()
+                    elif e.key == pygame.K_s: recorder.save_async()
+                    elif e.key == pygame.K_l:  # 'L' toggles species CSV
+                        logger.enable_species = not logger.enable_species
+                    elif e.key == pygame.K_t:
+                        renderer.panel_mode = "phylo" if renderer.panel_mode == "traits" else "traits"
+                        # --- inside the main event loop ---
+                    elif e.key == pygame.K_g:
+                        renderer.glyph_mode = "quads" if renderer.glyph_mode == "rings" else "rings"
 
-        if not paused:
-            for _ in range(sim_speed):
-                new_day_started = live.step()
-                if new_day_started:
-                    logger.append_day(
-                        day=live.day - 1,
-                        pop=live.last_population_snapshot or live.population,  # prefer the snapshot of the day that just ran
-                        food_per_day=int(WORLD.n_food),
-                        day_steps=int(WORLD.day_steps),
-                        notes=""
-                    )
-            recorder.maybe_capture(live)
+            if not paused:
+                for _ in range(sim_speed):
+                    new_day_started = live.step()
+                    if new_day_started:
+                        logger.append_day(
+                            day=live.day - 1,
+                            pop=live.last_population_snapshot or live.population,  # prefer the snapshot of the day that just ran
+                            food_per_day=int(WORLD.n_food),
+                            day_steps=int(WORLD.day_steps),
+                            notes=""
+                        )
+                recorder.maybe_capture(live)
 
-        screen.fill(BG_COLOR)
-        renderer.world_rect = world_rect
-        renderer.panel_rect = panel_rect
-        renderer.draw_hud(live, sim_speed, paused, recorder.enabled,
-                          (live.mutate_speed, live.mutate_size, live.mutate_sense))
-        renderer.draw_world(live)
-        renderer.draw_panel(live, lineage)
-        pygame.display.flip()
-
-    pygame.quit()
\ No newline at end of file
+            screen.fill(BG_COLOR)
+            renderer.world_rect = world_rect
+            renderer.panel_rect = panel_rect
+            renderer.draw_hud(live, sim_speed, paused, recorder.enabled,
+                              (live.mutate_speed, live.mutate_size, live.mutate_sense))
+            renderer.draw_world(live)
+            renderer.draw_panel(live, lineage)
+            pygame.display.flip()
+    finally:
+        logger.close()   # flush the buffered rows even if the loop raised
+        recorder.close()
+        pygame.quit()
\ No newline at end of file
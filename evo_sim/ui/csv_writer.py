@@ -3,7 +3,10 @@ from __future__ import annotations
 import csv
 import os
 import uuid
-from typing import Iterable, Dict, List, Optional
+from typing import Any, Iterable, Dict, List, Optional, TextIO
+
+import numpy as np
+
 from ..sim.models import Creature
 
 
@@ -24,15 +27,27 @@ class DailyCsvLogger:
                               pop=live.last_population_snapshot or live.population,
                               food_per_day=int(WORLD.n_food),
                               day_steps=int(WORLD.day_steps))
+        ...
+        logger.close()   # on exit: flushes the buffered rows
+
+    Both files stay open for the session (opened on first use) instead of being
+    reopened per day. Rows reach disk every `flush_every` days: 1 (default) keeps
+    the files current day by day; larger values batch writes at the risk of
+    losing the unflushed days if the process dies without close().
     """
     def __init__(self,
                  overall_path: str = "runs/ui_daily.csv",
                  species_path: str = "runs/ui_species_daily.csv",
-                 enable_species: bool = True):
+                 enable_species: bool = True,
+                 flush_every: int = 1):
         self.overall_path = overall_path
         self.species_path = species_path
         self.enable_species = enable_species
+        self.flush_every = max(1, int(flush_every))
         self.session_id = uuid.uuid4().hex[:8]
+        self._files: Dict[str, TextIO] = {}
+        self._writers: Dict[str, Any] = {}   # csv.writer per open file
+        self._days_unflushed = 0
 
         # Ensure folders exist
         if self.overall_path:
@@ -61,6 +76,15 @@ class DailyCsvLogger:
                 csv.DictWriter(f, fieldnames=self._species_header).writeheader()
 
     # ---------------- internal helpers ----------------
+    def _writer(self, path: str):
+        """Long-lived csv.writer appending to `path`."""
+        w = self._writers.get(path)
+        if w is None:
+            f = open(path, "a", newline="", buffering=1 << 16)
+            self._files[path] = f
+            w = self._writers[path] = csv.writer(f)
+        return w
+
     @staticmethod
     def _avg(xs: List[float]) -> float:
         return (sum(xs) / len(xs)) if xs else float("nan")
@@ -68,8 +92,9 @@ class DailyCsvLogger:
     @staticmethod
     def _quantiles(xs: List[float]) -> Dict[str, float]:
         """
-        Simple quantile helper (no numpy dependency).
-        Returns q25, q50, q75 plus min/max.
+        Nearest-rank quantile helper.
+        Returns q25, q50, q75 plus min/max; np.partition places just those five
+        ranks (O(n)) instead of sorting the whole list.
         """
         if not xs:
             return dict(
@@ -79,34 +104,44 @@ class DailyCsvLogger:
                 speed_q75=float("nan"),
                 speed_max=float("nan"),
             )
-        q = sorted(xs)
-        n = len(q)
-        def at(p: float) -> float:
-            if n == 1:
-                return q[0]
+        n = len(xs)
+        def rank(p: float) -> int:
             # nearest-rank style index
             i = int(round(p * (n - 1)))
-            return q[max(0, min(n - 1, i))]
+            return max(0, min(n - 1, i))
+        ranks = [0, rank(0.25), rank(0.50), rank(0.75), n - 1]
+        q = np.partition(np.asarray(xs, dtype=np.float64), ranks)
         return dict(
-            speed_min=q[0],
-            speed_q25=at(0.25),
-            speed_median=at(0.50),
-            speed_q75=at(0.75),
-            speed_max=q[-1],
+            speed_min=float(q[ranks[0]]),
+            speed_q25=float(q[ranks[1]]),
+            speed_median=float(q[ranks[2]]),
+            speed_q75=float(q[ranks[3]]),
+            speed_max=float(q[ranks[4]]),
         )
 
     def _overall_row(self, day: int, pop: Iterable[Creature], food_per_day: int, day_steps: int, notes: Optional[str]) -> Dict:
         pop = list(pop)
         n = len(pop)
-        alive_end = sum(1 for c in pop if c.alive)
-        ate0 = sum(1 for c in pop if c.eaten == 0)
-        ate1 = sum(1 for c in pop if c.eaten == 1)
-        ate2p = sum(1 for c in pop if c.eaten >= 2)
-
-        speeds = [c.speed for c in pop]
-        sizes  = [c.size for c in pop]
-        senses = [c.sense for c in pop]
-        mets   = [c.species.metabolism for c in pop]
+        # one pass: counts, left-to-right trait sums (same floats as _avg) and the speeds for quantiles
+        alive_end = ate0 = ate1 = ate2p = 0
+        s_speed = s_size = s_sense = s_met = 0.0
+        speeds: List[float] = []
+        for c in pop:
+            if c.alive:
+                alive_end += 1
+            eaten = c.eaten
+            if eaten == 0:
+                ate0 += 1
+            elif eaten == 1:
+                ate1 += 1
+            elif eaten >= 2:
+                ate2p += 1
+            speeds.append(c.speed)
+            s_speed += c.speed
+            s_size += c.size
+            s_sense += c.sense
+            s_met += c.species.metabolism
+        nan = float("nan")
 
         q = self._quantiles(speeds)
 
@@ -118,10 +153,10 @@ class DailyCsvLogger:
             ate0=ate0,
             ate1=ate1,
             ate2p=ate2p,
-            avg_speed=self._avg(speeds),
-            avg_size=self._avg(sizes),
-            avg_sense=self._avg(senses),
-            avg_metabolism=self._avg(mets),
+            avg_speed=s_speed / n if n else nan,
+            avg_size=s_size / n if n else nan,
+            avg_sense=s_sense / n if n else nan,
+            avg_metabolism=s_met / n if n else nan,
             speed_min=q["speed_min"],
             speed_q25=q["speed_q25"],
             speed_median=q["speed_median"],
@@ -163,13 +198,28 @@ class DailyCsvLogger:
         """Append one row (overall) and many rows (per species, if enabled)."""
         # Overall
         if self.overall_path:
-            with open(self.overall_path, "a", newline="") as f:
-                w = csv.DictWriter(f, fieldnames=self._overall_header)
-                w.writerow(self._overall_row(day, pop, food_per_day, day_steps, notes))
+            row = self._overall_row(day, pop, food_per_day, day_steps, notes)
+            self._writer(self.overall_path).writerow([row[k] for k in self._overall_header])
 
         # Per-species
         if self.enable_species and self.species_path:
-            with open(self.species_path, "a", newline="") as f:
-                w = csv.DictWriter(f, fieldnames=self._species_header)
-                for r in self._species_rows(day, pop):
-                    w.writerow(r)
+            w = self._writer(self.species_path)
+            header = self._species_header
+            w.writerows([r[k] for k in header] for r in self._species_rows(day, pop))
+
+        self._days_unflushed += 1
+        if self._days_unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+        self._days_unflushed = 0
+
+    def close(self):
+        """Flush and close the files; a later append_day reopens them."""
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        self._writers.clear()
+        self._days_unflushed = 0
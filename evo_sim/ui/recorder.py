@@ -1,9 +1,12 @@
 # evo_sim/ui/recorder.py
 from __future__ import annotations
 import os, time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 import numpy as np
 
+from ..sim.config import WORLD
+
 class Recorder:
     """
     Capture snapshots every `stride_steps` for Blender playback (NPZ).
@@ -16,21 +19,49 @@ class Recorder:
         self.dt = float(dt)
         self.steps_per_day = int(steps_per_day)
         self._tstep = 0
-        self.pos_list = []
-        self.traits_list = []
-        self.alive_list = []
-        self.done_list = []
-        self.day_step_list = []
-        self.food_xy_list = []
+        self._saver: Optional[ThreadPoolExecutor] = None   # save_async's writer thread
+        self._reset_frames()
+
+    def _reset_frames(self):
+        # Frame buffers, written in place and grown by doubling (_reserve). Unused
+        # slots keep the padding save_npz writes: NaN for coordinates, False for masks.
+        self.T = 0
         self.maxN = 0
         self.maxF = 0
+        self.pos   = np.full((0, 0, 2), np.nan, np.float32)
+        self.traits= np.full((0, 0, 3), np.nan, np.float32)
+        self.alive = np.zeros((0, 0), np.bool_)
+        self.done  = np.zeros((0, 0), np.bool_)
+        self.day_step = np.zeros((0, 2), np.int32)
+        self.fxy   = np.full((0, 0, 2), np.nan, np.float32)
+        self.fcnt  = np.zeros((0,), np.int32)
+
+    @staticmethod
+    def _grown(a: np.ndarray, shape, fill) -> np.ndarray:
+        out = np.full(shape, fill, a.dtype)
+        out[tuple(slice(0, k) for k in a.shape)] = a
+        return out
+
+    def _reserve(self, T: int, N: int, F: int):
+        """Make room for frame index T-1 with N creatures and F food."""
+        capT, capN, capF = self.pos.shape[0], self.pos.shape[1], self.fxy.shape[1]
+        if T <= capT and N <= capN and F <= capF:
+            return
+        capT = max(capT, T if T <= capT else max(T, 2 * capT, 64))
+        capN = max(capN, N if N <= capN else max(N, 2 * capN))
+        capF = max(capF, F if F <= capF else max(F, 2 * capF))
+        self.pos    = self._grown(self.pos,    (capT, capN, 2), np.nan)
+        self.traits = self._grown(self.traits, (capT, capN, 3), np.nan)
+        self.alive  = self._grown(self.alive,  (capT, capN), False)
+        self.done   = self._grown(self.done,   (capT, capN), False)
+        self.day_step = self._grown(self.day_step, (capT, 2), 0)
+        self.fxy    = self._grown(self.fxy,    (capT, capF, 2), np.nan)
+        self.fcnt   = self._grown(self.fcnt,   (capT,), 0)
 
     def toggle(self): self.enabled = not self.enabled; print(f"[Recorder] {'ON' if self.enabled else 'OFF'}")
     def clear(self):
         self._tstep = 0
-        self.pos_list.clear(); self.traits_list.clear(); self.alive_list.clear(); self.done_list.clear()
-        self.day_step_list.clear(); self.food_xy_list.clear()
-        self.maxN = self.maxF = 0
+        self._reset_frames()
         print("[Recorder] cleared")
 
     def maybe_capture(self, live):
@@ -40,64 +71,86 @@ class Recorder:
 
         pop = live.population
         N = len(pop); self.maxN = max(self.maxN, N)
-        pos = np.zeros((N,2), np.float32)
-        tr  = np.zeros((N,3), np.float32)
-        alive = np.zeros((N,), np.bool_)
-        done  = np.zeros((N,), np.bool_)
-
-        for i, c in enumerate(pop):
-            pos[i] = (c.x, c.y)
-            tr[i]  = (c.speed, c.size, c.sense)
-            alive[i] = c.alive
-            done[i]  = (c.alive and c.eaten >= 1 and c.at_home(live.world.home_margin))
-
-        self.pos_list.append(pos); self.traits_list.append(tr)
-        self.alive_list.append(alive); self.done_list.append(done)
-        self.day_step_list.append((live.day, live.step_in_day))
-
-        fxy = np.array(live.food_positions(), np.float32)
-        self.food_xy_list.append(fxy)
-        self.maxF = max(self.maxF, len(fxy))
+        # one pass over the creatures; every column is then a slice
+        a = np.array([(c.x, c.y, c.speed, c.size, c.sense, c.alive, c.eaten, c.home[0], c.home[1])
+                      for c in pop], np.float64).reshape(N, 9)
+        fxy = np.array(live.food_positions(), np.float32).reshape(-1, 2)
+        F = len(fxy); self.maxF = max(self.maxF, F)
+        t = self.T
+        self._reserve(t + 1, N, F)
 
-    def save_npz(self, out_path: Optional[str]=None):
-        if not self.pos_list:
-            print("[Recorder] nothing to save"); return None
+        self.pos[t, :N] = a[:, 0:2]
+        self.traits[t, :N] = a[:, 2:5]
+        alive = a[:, 5] != 0.0
+        # Creature.at_home(WORLD.home_margin), vectorized with the same float ops
+        dx = a[:, 0] - a[:, 7]
+        dy = a[:, 1] - a[:, 8]
+        self.alive[t, :N] = alive
+        m = WORLD.home_margin
+        self.done[t, :N] = alive & (a[:, 6] >= 1) & (dx*dx + dy*dy <= m * m)
+        self.day_step[t] = (live.day, live.step_in_day)
+        self.fxy[t, :F] = fxy
+        self.fcnt[t] = F
+        self.T = t + 1
 
-        T = len(self.pos_list); maxN = self.maxN; maxF = self.maxF
-        pos  = np.full((T, maxN, 2), np.nan, np.float32)
-        tr   = np.full((T, maxN, 3), np.nan, np.float32)
-        alive= np.zeros((T, maxN), np.bool_)
-        done = np.zeros((T, maxN), np.bool_)
-        day_step = np.zeros((T, 2), np.int32)
-        fxy  = np.full((T, maxF, 2), np.nan, np.float32)
-        fcnt = np.zeros((T,), np.int32)
-
-        for t in range(T):
-            N = self.pos_list[t].shape[0]
-            pos[t, :N] = self.pos_list[t]
-            tr[t, :N]  = self.traits_list[t]
-            alive[t, :N] = self.alive_list[t]
-            done[t, :N]  = self.done_list[t]
-            day_step[t] = self.day_step_list[t]
-            F = self.food_xy_list[t].shape[0]
-            fcnt[t] = F
-            if F: fxy[t, :F] = self.food_xy_list[t]
+    def _frames(self) -> dict:
+        """The recording as save_npz's arrays. Slices of the buffers, not copies:
+        later captures only write frames >= T and growing/clear() reallocate."""
+        T = self.T; maxN = self.maxN; maxF = self.maxF
+        return dict(
+            world_size=np.float32(self.world_size),
+            dt=np.float32(self.dt),
+            steps_per_day=np.int32(self.steps_per_day),
+            stride_steps=np.int32(self.stride_steps),
+            pos=self.pos[:T, :maxN], traits=self.traits[:T, :maxN],
+            alive=self.alive[:T, :maxN], done=self.done[:T, :maxN],
+            day_step=self.day_step[:T],
+            food_xy=self.fxy[:T, :maxF], food_count=self.fcnt[:T],
+        )
 
+    @staticmethod
+    def _out_path(out_path: Optional[str]) -> str:
         os.makedirs("recordings", exist_ok=True)
         if out_path is None:
             stamp = time.strftime("%Y%m%d_%H%M%S")
             out_path = os.path.join("recordings", f"evo_run_{stamp}.npz")
+        return out_path
 
-        np.savez_compressed(
-            out_path,
-            world_size=np.float32(self.world_size),
-            dt=np.float32(self.dt),
-            steps_per_day=np.int32(self.steps_per_day),
-            stride_steps=np.int32(self.stride_steps),
-            pos=pos, traits=tr,
-            alive=alive, done=done,
-            day_step=day_step,
-            food_xy=fxy, food_count=fcnt,
-        )
-        print(f"[Recorder] saved: {out_path} (T={T}, maxN={maxN})")
+    @staticmethod
+    def _write(out_path: str, frames: dict) -> str:
+        np.savez_compressed(out_path, **frames)
+        print(f"[Recorder] saved: {out_path} (T={frames['pos'].shape[0]}, maxN={frames['pos'].shape[1]})")
         return out_path
+
+    def save_npz(self, out_path: Optional[str]=None):
+        if not self.T:
+            print("[Recorder] nothing to save"); return None
+        return self._write(self._out_path(out_path), self._frames())
+
+    def save_async(self, out_path: Optional[str]=None) -> Optional[Future]:
+        """
+        save_npz on a background thread (zlib releases the GIL, so capturing
+        goes on meanwhile). Saves run one at a time, in order; the Future's
+        result is the path. A failed write is reported on stdout, since nobody
+        may be waiting on the Future. close() waits for pending saves.
+        """
+        if not self.T:
+            print("[Recorder] nothing to save"); return None
+        if self._saver is None:
+            self._saver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recorder")
+        out_path = self._out_path(out_path)
+        fut = self._saver.submit(self._write, out_path, self._frames())
+        fut.add_done_callback(lambda f: self._report_failure(f, out_path))
+        return fut
+
+    @staticmethod
+    def _report_failure(fut: Future, out_path: str):
+        exc = fut.exception()
+        if exc is not None:
+            print(f"[Recorder] save failed: {out_path}: {exc!r}")
+
+    def close(self):
+        """Wait for save_async writes still in flight."""
+        if self._saver is not None:
+            self._saver.shutdown(wait=True)
+            self._saver = None
@@ -151,8 +151,7 @@ class Renderer:
             fill = (25, 28, 34)
 
         # Diet outer ring color
-        diet = c.species.diet.lower()
-        diet_col = DIET_COLORS.get(diet, (180,180,180))
+        diet_col = DIET_COLORS.get(c.species.diet_key, (180,180,180))
 
         # Draw base fill
         pygame.draw.circle(self.screen, fill, (sx, sy), base_r)
@@ -339,15 +338,14 @@ class Renderer:
             sx = box.x + box.w * (0.5 + 0.75 * px)
             sy = box.y + box.h * (0.5 - 0.75 * py)
             r = 2 + int(2.0 * (c.size ** 0.8))
-            diet = c.species.diet.lower()
-            col = DIET_COLORS.get(diet, (180,180,180))
+            col = DIET_COLORS.get(c.species.diet_key, (180,180,180))
             pygame.draw.circle(self.screen, col, (int(sx), int(sy)), r)
 
         # axes
         self._draw_trait_axes(box, mins, maxs)
 
         # ---- Dynamic species legend ----
-        counts = Counter((c.species.name, c.species.diet.lower()) for c in pop)
+        counts = Counter((c.species.name, c.species.diet_key) for c in pop)
 
         # Sort species alphabetically
         sorted_items = sorted(counts.items(), key=lambda kv: kv[0][0])
@@ -10,19 +10,12 @@ Usage:
 import argparse
 import subprocess
 import sys
-import os
-import csv
+
+from session_log import latest_session_id
 
 def get_latest_session_id(overall_path: str) -> str | None:
-    if not os.path.exists(overall_path):
-        return None
-    last_sid = None
-    with open(overall_path, newline="") as f:
-        for row in csv.DictReader(f):
-            sid = row.get("session_id")
-            if sid:
-                last_sid = sid
-    return last_sid
+    # positional tail scan (csv.reader + session_id column index), shared with the launcher
+    return latest_session_id(overall_path)
 
 def main():
     ap = argparse.ArgumentParser()
@@ -30,6 +23,8 @@ def main():
     ap.add_argument("--species", default="runs/ui_species_daily.csv")
     ap.add_argument("--outdir", default="reports")
     ap.add_argument("--tag", default="")
+    ap.add_argument("--isolated", action="store_true",
+                    help="run the analysis in a separate Python process")
     args = ap.parse_args()
 
     # 1) Run the UI
@@ -46,8 +41,7 @@ def main():
         sys.exit(0)
 
     # 3) Analyze only this session
-    ana_cmd = [
-        sys.executable, "analyze_ui_csv.py",
+    ana_args = [
         "--overall", args.overall,
         "--species", args.species,
         "--outdir", args.outdir,
@@ -55,8 +49,18 @@ def main():
         "--session", sid
     ]
     print("[launcher] Analyzing session:", sid)
-    print("[launcher] Running:", " ".join(ana_cmd))
-    sys.exit(subprocess.call(ana_cmd))
+    if args.isolated:
+        ana_cmd = [sys.executable, "analyze_ui_csv.py", *ana_args]
+        print("[launcher] Running:", " ".join(ana_cmd))
+        sys.exit(subprocess.call(ana_cmd))
+
+    # In-process: skips a second interpreter start-up and module import
+    from analyze_ui_csv import main as analyze_main
+    print("[launcher] Running: analyze_ui_csv", " ".join(ana_args))
+    rc = analyze_main(ana_args)
+    if rc:
+        print(f"[launcher] Analysis failed (exit status {rc}).", file=sys.stderr)
+    sys.exit(rc)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Pandas-free helpers over the UI's daily CSV logs, shared by the launchers
+(choose_sim.py, run_sim_then_analyze.py) and analyze_ui_csv.py.
+"""
+import csv
+import os
+
+TAIL_BYTES = 32 * 1024   # first window latest_session_id reads; doubled until a session_id turns up
+
+def latest_session_id(overall_csv_path: str) -> str | None:
+    """
+    Return the last session_id in file order from a UI daily CSV (None if the
+    file is missing, has no session_id column or no non-empty session_id).
+    Reads the header, then scans backwards from the end of the file in a growing
+    window, so the cost doesn't grow with the CSV.
+    """
+    try:
+        with open(overall_csv_path, "rb") as f:
+            header = next(csv.reader([f.readline().decode("utf-8-sig")]), [])
+            if "session_id" not in header:
+                return None
+            col = header.index("session_id")
+            body_start = f.tell()
+            size = f.seek(0, os.SEEK_END)
+            window = TAIL_BYTES
+            while True:
+                start = max(size - window, body_start)
+                f.seek(start)
+                lines = f.read(size - start).decode("utf-8", errors="replace").splitlines()
+                if start > body_start:
+                    lines = lines[1:]   # the window's first line may be cut in half
+                for row in csv.reader(reversed(lines)):
+                    if len(row) > col and row[col]:
+                        return row[col]
+                if start == body_start:
+                    return None
+                window *= 2
+    except OSError:
+        return None
@@ -0,0 +1,86 @@
+"""analyze_ui_csv's <csv>.parquet cache: reuse, mtime invalidation, odd cache files."""
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+import analyze_ui_csv as A
+
+HEADER = "session_id,day,n,alive_end,ate0,ate1,ate2p,avg_speed,avg_size,avg_sense,avg_metabolism,food_per_day,day_steps,notes\n"
+
+
+def _write_csv(path, rows):
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for sid, day, n in rows:
+            f.write(f"{sid},{day},{n},{n},0,0,{n},1.5,1.0,10.0,1.0,150,1800,\n")
+
+
+def _load(path, session=None):
+    return A._load_table(str(path), A.OVERALL_DTYPES, A.OVERALL_NUM_COLS,
+                         fast_io=False, session=session, use_cache=True)
+
+
+def _age(path, seconds):
+    t = os.path.getmtime(path) - seconds
+    os.utime(path, (t, t))
+
+
+def test_cache_written_by_full_load_and_reused(tmp_path):
+    csv = tmp_path / "d.csv"
+    _write_csv(csv, [("a", 1, 10), ("a", 2, 12), ("b", 1, 20)])
+    df = _load(csv)
+    cache = tmp_path / "d.csv.parquet"
+    assert cache.exists()
+    # a newer cache wins over the CSV: plant a marker frame in it
+    marker = df.assign(n=df["n"] + 1000)
+    _age(csv, 10)
+    marker.to_parquet(cache, engine="pyarrow", index=False)
+    assert (_load(csv)["n"] >= 1000).all()
+    # session reads filter the cached rows
+    got = _load(csv, session="b")
+    assert got["session_id"].tolist() == ["b"] and got["n"].tolist() == [1020]
+
+
+def test_stale_cache_is_reparsed_and_rewritten(tmp_path):
+    csv = tmp_path / "d.csv"
+    _write_csv(csv, [("a", 1, 10)])
+    _load(csv)
+    cache = tmp_path / "d.csv.parquet"
+    _age(cache, 10)   # the CSV changed after the cache was written
+    _write_csv(csv, [("a", 1, 10), ("a", 2, 11)])
+    assert _load(csv)["n"].tolist() == [10, 11]
+    assert os.path.getmtime(cache) >= os.path.getmtime(csv)
+    assert pd.read_parquet(cache)["n"].tolist() == [10, 11]
+
+
+def test_session_read_of_cache_without_session_id(tmp_path, capsys):
+    csv = tmp_path / "d.csv"
+    _write_csv(csv, [("a", 1, 10), ("b", 2, 11)])
+    cache = tmp_path / "d.csv.parquet"
+    pd.DataFrame({"day": [1, 2], "n": [10, 11]}).to_parquet(cache, engine="pyarrow", index=False)
+    _age(csv, 10)
+    got = _load(csv, session="a")
+    # like a CSV without the column: nothing to filter on, the whole cache is returned
+    assert got["n"].tolist() == [10, 11]
+    assert "unreadable cache" not in capsys.readouterr().err
+
+
+def test_corrupt_cache_falls_back_to_csv(tmp_path, capsys):
+    csv = tmp_path / "d.csv"
+    _write_csv(csv, [("a", 1, 10), ("a", 2, 12)])
+    cache = tmp_path / "d.csv.parquet"
+    cache.write_bytes(b"not a parquet file")
+    _age(csv, 10)
+    assert _load(csv)["n"].tolist() == [10, 12]
+    assert "unreadable cache" in capsys.readouterr().err
+    # the full parse replaced the broken cache
+    assert pd.read_parquet(cache)["n"].tolist() == [10, 12]
+
+
+def test_session_read_does_not_write_cache(tmp_path):
+    csv = tmp_path / "d.csv"
+    _write_csv(csv, [("a", 1, 10), ("b", 1, 20)])
+    assert _load(csv, session="a")["n"].tolist() == [10]
+    assert not (tmp_path / "d.csv.parquet").exists()
@@ -0,0 +1,55 @@
+"""analyze_ui_csv's numba groupby-mean kernel against pandas groupby().mean()."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyze_ui_csv as A
+
+pytestmark = pytest.mark.skipif(not A.HAVE_NUMBA, reason="numba not installed")
+
+
+def _pandas_mean(df, keys, cols):
+    return df.groupby(keys, sort=False, observed=True)[cols].mean().reset_index()
+
+
+def _frame(seed=0, n=200):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "session_id": rng.choice(["s2", "s1", "s3"], n),
+        "day": rng.integers(1, 15, n).astype(np.int32),   # unsorted, repeated
+        "n": rng.integers(0, 80, n).astype(np.float32),
+        "avg_speed": rng.uniform(0.5, 3.0, n).astype(np.float32),
+        "avg_sense": rng.uniform(5.0, 40.0, n),            # float64 column
+    })
+    for c in ("n", "avg_speed", "avg_sense"):
+        df.loc[rng.random(n) < 0.15, c] = np.nan
+    df.loc[df["day"] == 7, "avg_speed"] = np.nan           # a group whose column is all NaN
+    return df
+
+
+@pytest.mark.parametrize("keys", [["day"], ["session_id", "day"]])
+def test_kernel_matches_pandas(keys):
+    df = _frame()
+    cols = ["n", "avg_speed", "avg_sense"]
+    got = A._numba_groupby_mean(df, keys, cols)
+    want = _pandas_mean(df, keys, cols)
+    # same groups in the same (first-appearance) order, same dtypes; sums may differ by an ulp
+    pd.testing.assert_frame_equal(got, want, check_exact=False, rtol=1e-6)
+
+
+def test_kernel_matches_pandas_with_categorical_and_nan_keys():
+    df = _frame(seed=1)
+    df["species_id"] = pd.Series(np.where(np.arange(len(df)) % 9 == 0, np.nan, df["day"] % 4))
+    df["session_id"] = df["session_id"].astype("category")
+    keys, cols = ["session_id", "species_id"], ["n", "avg_speed"]
+    got = A._numba_groupby_mean(df, keys, cols)
+    want = _pandas_mean(df, keys, cols)   # rows with a NaN key are dropped by both
+    pd.testing.assert_frame_equal(got, want, check_exact=False, rtol=1e-6)
+
+
+def test_groupby_mean_routes_to_kernel_above_threshold(monkeypatch):
+    df = _frame(seed=2)
+    monkeypatch.setattr(A, "NUMBA_GROUPBY_MIN_ROWS", 0)
+    got = A.groupby_mean(df, ["day"], ["n", "avg_sense"])
+    pd.testing.assert_frame_equal(got, _pandas_mean(df, ["day"], ["n", "avg_sense"]),
+                                  check_exact=False, rtol=1e-6)
@@ -0,0 +1,62 @@
+"""session_log.latest_session_id: the header + growing tail-window scan."""
+import pytest
+
+import session_log
+from session_log import latest_session_id
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_small_file(tmp_path):
+    p = _write(tmp_path / "d.csv", "session_id,day\naaa,1\nbbb,2\n")
+    assert latest_session_id(p) == "bbb"
+
+
+def test_session_id_not_first_column(tmp_path):
+    p = _write(tmp_path / "d.csv", "day,session_id,notes\n1,aaa,x\n2,bbb,\"a, b\"\n")
+    assert latest_session_id(p) == "bbb"
+
+
+def test_last_line_longer_than_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_log, "TAIL_BYTES", 16)
+    p = _write(tmp_path / "d.csv", "session_id,day,notes\naaa,1,x\nbbb,2," + "n" * 100 + "\n")
+    assert latest_session_id(p) == "bbb"
+
+
+def test_window_grows_past_empty_session_ids(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_log, "TAIL_BYTES", 64)
+    body = "".join(f",{i}\n" for i in range(500))
+    p = _write(tmp_path / "d.csv", "session_id,day\nfirst,0\n" + body)
+    assert latest_session_id(p) == "first"
+
+
+@pytest.mark.parametrize("tail", ["", "\n", "\n\n\n", "\r\n\r\n"])
+def test_trailing_newlines_and_blank_lines(tmp_path, tail):
+    p = _write(tmp_path / "d.csv", "session_id,day\naaa,1\nbbb,2" + tail)
+    assert latest_session_id(p) == "bbb"
+
+
+def test_header_only(tmp_path):
+    assert latest_session_id(_write(tmp_path / "d.csv", "session_id,day\n")) is None
+    assert latest_session_id(_write(tmp_path / "e.csv", "session_id,day")) is None
+
+
+def test_only_empty_session_ids(tmp_path):
+    assert latest_session_id(_write(tmp_path / "d.csv", "session_id,day\n,1\n,2\n")) is None
+
+
+def test_no_session_id_column(tmp_path):
+    assert latest_session_id(_write(tmp_path / "d.csv", "day,n\n1,2\n")) is None
+
+
+def test_missing_file(tmp_path):
+    assert latest_session_id(str(tmp_path / "nope.csv")) is None
+
+
+def test_utf8_bom_header(tmp_path):
+    p = tmp_path / "d.csv"
+    p.write_bytes("\ufeffsession_id,day\naaa,1\n".encode("utf-8"))
+    assert latest_session_id(str(p)) == "aaa"